@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 # Импортируем Base и модели
+from app.config import settings
 from app.database import Base
 from app.models import User, Item, Tag, item_tags
 
@@ -18,6 +19,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Миграции применяются к той же БД, что и приложение (DATABASE_URL)
+config.set_main_option("sqlalchemy.url", settings.database_url)
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 target_metadata = Base.metadata
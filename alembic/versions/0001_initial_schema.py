@@ -0,0 +1,77 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Таблицы могли быть созданы через Base.metadata.create_all() — не пересоздаём
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("display_name", sa.String(length=255), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    
+    if "items" not in existing:
+        op.create_table(
+            "items",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("title", sa.String(length=500), nullable=False),
+            sa.Column("kind", sa.Enum("BOOK", "ARTICLE", name="itemkind"), nullable=False),
+            sa.Column("status", sa.Enum("PLANNED", "READING", "DONE", name="itemstatus"), nullable=False),
+            sa.Column("priority", sa.Enum("LOW", "NORMAL", "HIGH", name="itempriority"), nullable=False),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_items_id", "items", ["id"])
+        op.create_index("ix_items_user_id", "items", ["user_id"])
+        op.create_index("ix_items_kind", "items", ["kind"])
+        op.create_index("ix_items_status", "items", ["status"])
+        op.create_index("ix_items_priority", "items", ["priority"])
+        op.create_index("ix_items_created_at", "items", ["created_at"])
+    
+    if "tags" not in existing:
+        op.create_table(
+            "tags",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.UniqueConstraint("user_id", "name", name="uq_user_tag_name"),
+        )
+        op.create_index("ix_tags_id", "tags", ["id"])
+        op.create_index("ix_tags_user_id", "tags", ["user_id"])
+    
+    if "item_tags" not in existing:
+        op.create_table(
+            "item_tags",
+            sa.Column("item_id", sa.Integer(), sa.ForeignKey("items.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("item_tags")
+    op.drop_table("tags")
+    op.drop_table("items")
+    op.drop_table("users")
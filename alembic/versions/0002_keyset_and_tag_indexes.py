@@ -0,0 +1,29 @@
+"""Keyset pagination and tag-first indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:10:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_items_created_at_id", "items", ["created_at", "id"], if_not_exists=True)
+    op.create_index("ix_items_updated_at_id", "items", ["updated_at", "id"], if_not_exists=True)
+    op.create_index("ix_items_priority_id", "items", ["priority", "id"], if_not_exists=True)
+    op.create_index("ix_item_tags_tag_id_item_id", "item_tags", ["tag_id", "item_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_item_tags_tag_id_item_id", table_name="item_tags")
+    op.drop_index("ix_items_priority_id", table_name="items")
+    op.drop_index("ix_items_updated_at_id", table_name="items")
+    op.drop_index("ix_items_created_at_id", table_name="items")
@@ -0,0 +1,81 @@
+"""Full-text search index on items.title / items.notes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        title, notes, content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF title, notes ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+        INSERT INTO items_fts(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+    END
+    """,
+    # Backfill существующих строк
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+]
+
+# GIN-индекс по выражению строится сразу по всем строкам и обновляется сам
+POSTGRES_UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_items_search ON items USING GIN "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(notes, '')))",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_items_search",
+]
+
+
+def _run(sqlite_statements, postgres_statements) -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        statements = sqlite_statements
+    elif dialect == "postgresql":
+        statements = postgres_statements
+    else:
+        return
+    for statement in statements:
+        op.execute(sa.text(statement))
+
+
+def upgrade() -> None:
+    _run(SQLITE_UPGRADE, POSTGRES_UPGRADE)
+
+
+def downgrade() -> None:
+    _run(SQLITE_DOWNGRADE, POSTGRES_DOWNGRADE)
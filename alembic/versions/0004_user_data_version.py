@@ -0,0 +1,31 @@
+"""Per-user data version for conditional GET
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("users")}
+    with op.batch_alter_table("users") as batch_op:
+        if "data_version" not in columns:
+            batch_op.add_column(sa.Column("data_version", sa.Integer(), server_default="0", nullable=False))
+        if "data_modified_at" not in columns:
+            batch_op.add_column(sa.Column("data_modified_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("data_modified_at")
+        batch_op.drop_column("data_version")
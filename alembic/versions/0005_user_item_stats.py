@@ -0,0 +1,38 @@
+"""Per-user item counters for GET /users/{id}/stats
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("user_item_stats"):
+        op.create_table(
+            "user_item_stats",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("dimension", sa.String(16), primary_key=True),
+            sa.Column("key", sa.String(32), primary_key=True),
+            sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        )
+    
+    # Backfill счётчиков по существующим элементам
+    from app.stats import rebuild_stats
+    
+    rebuild_stats(Session(bind=bind))
+
+
+def downgrade() -> None:
+    op.drop_table("user_item_stats")
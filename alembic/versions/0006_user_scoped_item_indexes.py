@@ -0,0 +1,44 @@
+"""User-scoped composite indexes for list_items
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_items_user_id_created_at_id", "items", ["user_id", "created_at", "id"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_items_user_id_updated_at_id", "items", ["user_id", "updated_at", "id"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_items_user_id_status_created_at_id", "items", ["user_id", "status", "created_at", "id"],
+        if_not_exists=True,
+    )
+    # Покрыты составными индексами (префикс) или первичным ключом
+    op.drop_index("ix_items_user_id", table_name="items", if_exists=True)
+    op.drop_index("ix_items_created_at", table_name="items", if_exists=True)
+    op.drop_index("ix_items_id", table_name="items", if_exists=True)
+    # Статистика распределения, чтобы планировщик выбирал новые индексы
+    op.execute(sa.text("ANALYZE items"))
+
+
+def downgrade() -> None:
+    op.create_index("ix_items_id", "items", ["id"], if_not_exists=True)
+    op.create_index("ix_items_created_at", "items", ["created_at"], if_not_exists=True)
+    op.create_index("ix_items_user_id", "items", ["user_id"], if_not_exists=True)
+    op.drop_index("ix_items_user_id_status_created_at_id", table_name="items")
+    op.drop_index("ix_items_user_id_updated_at_id", table_name="items")
+    op.drop_index("ix_items_user_id_created_at_id", table_name="items")
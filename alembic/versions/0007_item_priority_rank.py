@@ -0,0 +1,45 @@
+"""Numeric priority rank for index-friendly priority ordering
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+# Ранг вычисляется из имени члена enum, хранящегося в priority
+PRIORITY_RANK_SQL = "CASE priority WHEN 'LOW' THEN 0 WHEN 'NORMAL' THEN 1 WHEN 'HIGH' THEN 2 END"
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("items")}
+    if "priority_rank" not in columns:
+        # Генерируемая колонка заполняется для существующих строк сама:
+        # в SQLite — VIRTUAL (ADD COLUMN без пересоздания таблицы), в PostgreSQL — STORED
+        op.add_column(
+            "items",
+            sa.Column("priority_rank", sa.SmallInteger(), sa.Computed(PRIORITY_RANK_SQL), nullable=False),
+        )
+    op.create_index(
+        "ix_items_user_id_priority_rank_id", "items", ["user_id", "priority_rank", "id"], if_not_exists=True,
+    )
+    op.create_index("ix_items_priority_rank_id", "items", ["priority_rank", "id"], if_not_exists=True)
+    op.drop_index("ix_items_priority_id", table_name="items", if_exists=True)
+    op.execute(sa.text("ANALYZE items"))
+
+
+def downgrade() -> None:
+    op.create_index("ix_items_priority_id", "items", ["priority", "id"], if_not_exists=True)
+    op.drop_index("ix_items_priority_rank_id", table_name="items")
+    op.drop_index("ix_items_user_id_priority_rank_id", table_name="items")
+    # ALTER TABLE DROP COLUMN без batch-режима (SQLite >= 3.35): пересоздание items удалило бы триггеры FTS
+    op.drop_column("items", "priority_rank")
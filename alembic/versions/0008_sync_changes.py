@@ -0,0 +1,43 @@
+"""Change log for delta sync (GET /sync)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("sync_changes"):
+        op.create_table(
+            "sync_changes",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("entity", sa.String(8), primary_key=True),
+            sa.Column("entity_id", sa.Integer(), primary_key=True),
+            sa.Column("seq", sa.Integer(), nullable=False),
+            sa.Column("deleted", sa.Boolean(), server_default="0", nullable=False),
+        )
+    op.create_index(
+        "ix_sync_changes_user_id_seq", "sync_changes", ["user_id", "seq", "entity", "entity_id"], if_not_exists=True,
+    )
+    
+    # Существующие items/tags попадают в журнал с новой версией пользователя
+    from app.sync import backfill_changes
+    
+    backfill_changes(Session(bind=bind))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_changes_user_id_seq", table_name="sync_changes")
+    op.drop_table("sync_changes")
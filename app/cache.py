@@ -0,0 +1,208 @@
+"""Кеш ответов для чтения items/tags с инвалидацией при записи
+
+Ключи строятся из пространства имён, версии данных пользователя и
+нормализованных параметров запроса. Запись увеличивает версию пользователя
+(и глобальную версию для списков без user_id), поэтому старые записи
+перестают находиться и вытесняются по TTL/LRU — удалять их по шаблону не нужно.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional, Protocol
+
+from fastapi import Response
+
+from app.config import settings
+from app.instrumentation import timed_serialization
+from app.serialization import dumps
+
+GLOBAL_SCOPE = "all"
+
+
+class CacheBackend(Protocol):
+    """Интерфейс хранилища (совместим по методам с redis-py)"""
+    
+    def get(self, key: str) -> Optional[bytes]: ...
+    
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> Any: ...
+    
+    def incr(self, key: str) -> int: ...
+    
+    def get_counter(self, key: str) -> int: ...
+
+
+class InMemoryBackend:
+    """In-process LRU с TTL и ограничением по числу записей"""
+    
+    def __init__(self, max_entries: int, default_ttl: Optional[int] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: OrderedDict[str, tuple[Optional[float], bytes]] = OrderedDict()
+        # Версии хранятся отдельно: вытеснение версии из LRU «воскресило» бы старые записи
+        self._counters: dict[str, int] = {}
+        self._lock = Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        ttl = ex if ex is not None else self.default_ttl
+        expires_at = monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+    
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+    
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+
+class RedisBackend:
+    """Хранилище поверх Redis-совместимого клиента (redis-py или фейк с теми же методами)"""
+    
+    def __init__(self, client, prefix: str = "reading-list:"):
+        self.client = client
+        self.prefix = prefix
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+    
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self.client.set(self.prefix + key, value, ex=ex)
+    
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+    
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+
+class ResponseCache:
+    """Read-through кеш сериализованных ответов"""
+    
+    def __init__(self, backend, ttl: int, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+    
+    def _version(self, scope) -> int:
+        return self.backend.get_counter(f"version:{scope}")
+    
+    def make_key(self, namespace: str, scope, params: dict) -> str:
+        """Ключ = пространство имён + область (user_id / all) + её версия + хеш параметров"""
+        normalized = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        scope = GLOBAL_SCOPE if scope is None else scope
+        return f"{namespace}:{scope}:v{self._version(scope)}:{digest}"
+    
+    def make_object_key(self, namespace: str, object_id: int, variant: str = "") -> Optional[str]:
+        """Ключ для объекта по id (get_item/get_tag); variant — вид представления (набор полей)
+        
+        Владелец объекта неизвестен до загрузки, поэтому связь id → user_id
+        запоминается при первом чтении. Пока её нет, ключа нет и ответ не
+        кешируется: версия владельца должна быть прочитана до запроса к БД,
+        иначе конкурентная запись могла бы оставить в кеше устаревший ответ.
+        """
+        if not self.enabled:
+            return None
+        owner = self.backend.get(f"owner:{namespace}:{object_id}")
+        if owner is None:
+            return None
+        owner = int(owner)
+        return f"{namespace}:{object_id}:{owner}:v{self._version(owner)}:{variant}"
+    
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def get(self, key: Optional[str]) -> Optional[Response]:
+        """Вернуть готовый ответ из кеша или None"""
+        if not self.enabled or key is None:
+            return None
+        value = self.backend.get(key)
+        self._count(value is not None)
+        if value is None:
+            return None
+        return Response(content=value, media_type="application/json")
+    
+    def store(self, key: Optional[str], payload: Any) -> Response:
+        """Сериализовать ответ (словарь по схеме ответа), сохранить в кеш (если есть ключ) и вернуть его"""
+        with timed_serialization():
+            body = dumps(payload)
+        if self.enabled and key is not None:
+            self.backend.set(key, body, ex=self.ttl)
+        return Response(content=body, media_type="application/json")
+    
+    def store_object(
+        self, key: Optional[str], namespace: str, object_id: int, owner: int, payload: Any,
+    ) -> Response:
+        """Как store, но для объекта по id: если владелец ещё неизвестен
+        (или сменился), ответ не кешируется, а владелец запоминается"""
+        if key is not None and not key.startswith(f"{namespace}:{object_id}:{owner}:"):
+            key = None
+        if key is None and self.enabled:
+            self.backend.set(f"owner:{namespace}:{object_id}", str(owner).encode(), ex=self.ttl)
+        return self.store(key, payload)
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Сбросить кеш пользователя и списков без фильтра по пользователю"""
+        if not self.enabled:
+            return
+        self.backend.incr(f"version:{user_id}")
+        self.backend.incr(f"version:{GLOBAL_SCOPE}")
+    
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+
+def _create_backend():
+    """Выбрать хранилище по настройкам"""
+    if settings.cache_backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        return RedisBackend(redis.Redis.from_url(settings.redis_url))
+    return InMemoryBackend(max_entries=settings.cache_max_entries, default_ttl=settings.cache_ttl)
+
+
+response_cache = ResponseCache(_create_backend(), ttl=settings.cache_ttl, enabled=settings.cache_enabled)
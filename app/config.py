@@ -9,6 +9,54 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     
+    # Production-сервер (python -m app.serve): 0 воркеров — по числу CPU
+    server_workers: int = 0
+    server_backlog: int = 2048
+    server_keep_alive: int = 5
+    server_graceful_timeout: int = 30
+    server_access_log: bool = False
+    # Подготовка БД перед запуском воркеров: migrate (alembic upgrade head) | create_all | none.
+    # create_all создаёт только недостающие таблицы и не обновляет существующую БД
+    db_init: str = "migrate"
+    
+    # Пул соединений (для SQLite в памяти не применяется)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    
+    # PRAGMA для SQLite, применяются к каждому новому соединению
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size: int = -64000
+    
+    # Кеш ответов на чтение (memory — in-process LRU, redis — внешний)
+    cache_enabled: bool = True
+    cache_backend: str = "memory"
+    cache_ttl: int = 30
+    cache_max_entries: int = 10000
+    redis_url: str = "redis://localhost:6379/0"
+    
+    # Push-уведомления (memory — в пределах процесса, redis — pub/sub между воркерами)
+    events_backend: str = "memory"
+    events_queue_size: int = 100
+    events_heartbeat: float = 15.0
+    
+    # Асинхронный стек БД (AsyncSession + async роутеры)
+    async_db: bool = False
+    
+    # Инструментирование: заголовок Server-Timing, лог запросов и порог медленных SQL (мс, 0 — выкл.)
+    server_timing: bool = True
+    request_log: bool = False
+    slow_query_ms: float = 200.0
+    
+    # Кеш общего количества для total_mode=fast (секунды / число ключей)
+    count_cache_ttl: float = 30.0
+    count_cache_size: int = 1024
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
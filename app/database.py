@@ -1,23 +1,198 @@
 """Настройка подключения к базе данных"""
-from sqlalchemy import create_engine
+from time import perf_counter
+from typing import Sequence
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.instrumentation import record_query
+
+
+def _is_sqlite(database_url: str) -> bool:
+    """Используется ли SQLite"""
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def _engine_options(database_url: str, is_async: bool = False) -> dict:
+    """Параметры пула соединений из настроек"""
+    url = make_url(database_url)
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    # SQLite в памяти использует однопоточный/статический пул без размеров
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if is_async:
+        # aiosqlite по умолчанию использует NullPool — явно включаем пул
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Настройка каждого нового соединения SQLite"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    # Без этого ondelete="CASCADE" у внешних ключей не соблюдается
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# Время начала хранится в контексте выполнения, а не в conn.info: при ошибке SQL
+# after_cursor_execute не вызывается, и запись осталась бы на соединении в пуле
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started", None)
+    if started is not None:
+        record_query(statement, perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # Упавший запрос тоже учитывается: его время входит в обработку HTTP-запроса
+    _after_cursor_execute(None, None, exception_context.statement, None, exception_context.execution_context, False)
+
+
+def instrument_engine(sync_engine) -> None:
+    """Учитывать SQL-запросы движка в статистике текущего HTTP-запроса"""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
 
 # Создание движка БД
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    connect_args={"check_same_thread": False} if _is_sqlite(settings.database_url) else {},
+    **_engine_options(settings.database_url),
 )
+if _is_sqlite(settings.database_url):
+    event.listen(engine, "connect", set_sqlite_pragmas)
+instrument_engine(engine)
 
 # Создание фабрики сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронные драйверы для поддерживаемых бэкендов
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Преобразовать URL синхронного драйвера в URL асинхронного"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Async database stack is not supported for '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Асинхронный движок создаётся только при включённом async_db,
+# чтобы aiosqlite/asyncpg не требовались в синхронном режиме
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_db:
+    async_engine = create_async_engine(
+        get_async_database_url(settings.database_url),
+        **_engine_options(settings.database_url, is_async=True),
+    )
+    if _is_sqlite(settings.database_url):
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=True)
+
+# Синхронный Engine, через который идут запросы API (при ASYNC_DB=true — обёрнутый async_engine):
+# его пул показывают метрики, на нём же слушают события выполнения SQL
+serving_engine = async_engine.sync_engine if async_engine is not None else engine
+
 # Базовый класс для моделей
 Base = declarative_base()
 
 
+def init_db() -> None:
+    """Создать недостающие таблицы и индексы
+    
+    Выполняется один раз перед запуском сервера (app.serve), а не при импорте
+    приложения: воркеры стартуют без DDL и не конкурируют за создание схемы.
+    """
+    import app.models  # noqa: F401 — регистрация моделей в Base.metadata
+    
+    Base.metadata.create_all(bind=engine)
+
+
+async def dispose_engines() -> None:
+    """Закрыть соединения пулов (при остановке воркера)"""
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def _dialect_insert(db, table, helper: str):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    raise NotImplementedError(f"{helper} is not supported for '{dialect}'")
+
+
+def insert_ignore(db, table, rows: list[dict], returning: Sequence = ()) -> list:
+    """INSERT ... ON CONFLICT DO NOTHING для списка строк
+    
+    Без returning — executemany; с returning — один многострочный INSERT ... RETURNING,
+    который возвращает только действительно вставленные строки.
+    """
+    if not rows:
+        return []
+    statement = _dialect_insert(db, table, "insert_ignore").on_conflict_do_nothing()
+    if not returning:
+        db.execute(statement, rows)
+        return []
+    return db.execute(statement.values(rows).returning(*returning)).all()
+
+
+def upsert(db, table, rows: list[dict], key_columns: list[str], update_columns: list[str]) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE SET колонки = excluded.колонки (executemany)"""
+    if not rows:
+        return
+    statement = _dialect_insert(db, table, "upsert")
+    statement = statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: statement.excluded[column] for column in update_columns},
+    )
+    db.execute(statement, rows)
+
+
+def insert_or_increment(db, table, rows: list[dict], key_columns: list[str], counter: str) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE counter = counter + excluded.counter (executemany)"""
+    if not rows:
+        return
+    statement = _dialect_insert(db, table, "insert_or_increment")
+    statement = statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={counter: table.c[counter] + statement.excluded[counter]},
+    )
+    db.execute(statement, rows)
+
+
 def get_db():
     """Генератор сессий БД для dependency injection"""
     db = SessionLocal()
@@ -26,3 +201,11 @@ def get_db():
     finally:
         db.close()
 
+
+
+async def get_async_db():
+    """Генератор асинхронных сессий БД для dependency injection"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database stack is disabled (set ASYNC_DB=true)")
+    async with AsyncSessionLocal() as db:
+        yield db
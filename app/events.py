@@ -0,0 +1,209 @@
+"""Push-уведомления об изменениях данных пользователя (SSE / WebSocket)
+
+Запись в журнал синхронизации (app.versioning.record_changes) откладывает
+событие в сессии; после commit оно публикуется через брокер, а шина
+каждого воркера раздаёт его подписчикам этого пользователя. Событие
+содержит только id изменённых объектов и версию — сами данные клиент
+забирает через GET /sync.
+
+Брокер выбирается настройкой EVENTS_BACKEND: memory — в пределах процесса,
+redis — Redis pub/sub, чтобы событие дошло до подписчиков на всех воркерах.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from threading import Lock
+from typing import Callable, Optional, Protocol
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.serialization import dumps
+
+logger = logging.getLogger("app.events")
+
+# Сообщение подписчику, пропустившему события (переполнение очереди): нужен GET /sync
+RESYNC = b'{"type":"resync"}'
+
+Deliver = Callable[[str, bytes], None]
+
+
+class EventBroker(Protocol):
+    """Интерфейс доставки сообщений между воркерами"""
+    
+    def start(self, deliver: Deliver) -> None: ...
+    
+    def publish(self, channel: str, message: bytes) -> None: ...
+    
+    def close(self) -> None: ...
+
+
+class LocalBroker:
+    """Доставка в пределах процесса (один воркер, тесты)"""
+    
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+    
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+    
+    def publish(self, channel: str, message: bytes) -> None:
+        if self._deliver is not None:
+            self._deliver(channel, message)
+    
+    def close(self) -> None:
+        self._deliver = None
+
+
+class RedisBroker:
+    """Redis pub/sub поверх redis-py: каждый воркер слушает каналы в фоновом потоке"""
+    
+    def __init__(self, client, prefix: str = "reading-list:events:"):
+        self.client = client
+        self.prefix = prefix
+        self._thread = None
+    
+    def start(self, deliver: Deliver) -> None:
+        def handler(message):
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            deliver(channel[len(self.prefix):], message["data"])
+        
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{f"{self.prefix}*": handler})
+        self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    
+    def publish(self, channel: str, message: bytes) -> None:
+        self.client.publish(self.prefix + channel, message)
+    
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+class Subscription:
+    """Очередь событий одного подключения, привязанная к его event loop"""
+    
+    def __init__(self, user_id: int, max_size: int):
+        self.user_id = user_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max_size)
+    
+    def put(self, message: bytes) -> None:
+        """Положить сообщение (из любого потока)"""
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event loop подключения уже закрыт
+            pass
+    
+    def _put(self, message: bytes) -> None:
+        if self._queue.full():
+            # Медленный клиент: старые события бесполезны, он догонит через GET /sync
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            message = RESYNC
+        self._queue.put_nowait(message)
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Следующее сообщение или None по таймауту"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Подписки воркера и публикация событий через брокер"""
+    
+    def __init__(self, broker, queue_size: int):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+        self._started = False
+        self._lock = Lock()
+    
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if not self._started:
+                self.broker.start(self._deliver)
+                self._started = True
+    
+    def publish(self, user_id: int, payload: dict) -> None:
+        """Опубликовать событие для всех подписчиков пользователя (на всех воркерах)"""
+        self._ensure_started()
+        self.published += 1
+        self.broker.publish(f"user:{user_id}", dumps(payload))
+    
+    def _deliver(self, channel: str, message: bytes) -> None:
+        scope, _, user_id = channel.partition(":")
+        if scope != "user" or not user_id.isdigit():
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(int(user_id), ()))
+        for subscription in subscribers:
+            subscription.put(message)
+    
+    def subscribe(self, user_id: int) -> Subscription:
+        """Подписаться на события пользователя (вызывается в event loop подключения)"""
+        self._ensure_started()
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+    
+    def subscribers(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._started:
+                self.broker.close()
+                self._started = False
+
+
+def queue_event(db: Session, user_id: int, payload: dict) -> None:
+    """Отложить событие до commit сессии (при откате оно отбрасывается)"""
+    db.info.setdefault("pending_events", []).append((user_id, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session: Session) -> None:
+    for user_id, payload in session.info.pop("pending_events", ()):
+        try:
+            event_bus.publish(user_id, payload)
+        except Exception:
+            # Данные уже зафиксированы; клиент получит изменения при следующем GET /sync
+            logger.exception("Failed to publish change event for user %s", user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_events(session: Session) -> None:
+    session.info.pop("pending_events", None)
+
+
+def _create_broker():
+    """Выбрать брокер по настройкам"""
+    if settings.events_backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_BACKEND=redis requires the 'redis' package")
+        return RedisBroker(redis.Redis.from_url(settings.redis_url))
+    return LocalBroker()
+
+
+event_bus = EventBus(_create_broker(), queue_size=settings.events_queue_size)
@@ -0,0 +1,94 @@
+"""Потоковая выгрузка списка чтения пользователя (NDJSON / CSV)"""
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import Item, Tag, item_tags
+
+# Размер пачки строк, читаемых с серверного курсора
+EXPORT_BATCH_SIZE = 500
+
+# Размер фрагмента ответа, после которого он отправляется клиенту
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FIELDS = [
+    "id", "user_id", "title", "kind", "status", "priority",
+    "notes", "created_at", "updated_at", "tags",
+]
+
+
+def _iter_items(user_id: int) -> Iterator[dict]:
+    """Элементы пользователя пачками с серверного курсора, теги — одним запросом на пачку"""
+    db = SessionLocal()
+    try:
+        statement = (
+            select(
+                Item.id, Item.user_id, Item.title, Item.kind, Item.status, Item.priority,
+                Item.notes, Item.created_at, Item.updated_at,
+            )
+            .where(Item.user_id == user_id)
+            .order_by(Item.id)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        for partition in db.execute(statement).partitions():
+            item_ids = [row.id for row in partition]
+            tags_by_item = defaultdict(list)
+            tag_rows = db.execute(
+                select(item_tags.c.item_id, Tag.id, Tag.name)
+                .join(Tag, Tag.id == item_tags.c.tag_id)
+                .where(item_tags.c.item_id.in_(item_ids))
+                .order_by(Tag.name)
+            )
+            for item_id, tag_id, tag_name in tag_rows:
+                tags_by_item[item_id].append({"id": tag_id, "name": tag_name})
+            
+            for row in partition:
+                yield {
+                    "id": row.id,
+                    "user_id": row.user_id,
+                    "title": row.title,
+                    "kind": row.kind.value,
+                    "status": row.status.value,
+                    "priority": row.priority.value,
+                    "notes": row.notes,
+                    "created_at": row.created_at.isoformat(),
+                    "updated_at": row.updated_at.isoformat(),
+                    "tags": tags_by_item.get(row.id, []),
+                }
+    finally:
+        db.close()
+
+
+def export_ndjson(user_id: int) -> Iterator[str]:
+    """Один JSON-объект на строку"""
+    lines = []
+    size = 0
+    for item in _iter_items(user_id):
+        line = json.dumps(item, ensure_ascii=False) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines.clear()
+            size = 0
+    yield "".join(lines)
+
+
+def export_csv(user_id: int) -> Iterator[str]:
+    """CSV с заголовком; теги — имена через ';'"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for item in _iter_items(user_id):
+        writer.writerow({**item, "tags": ";".join(tag["name"] for tag in item["tags"])})
+        # Отдаём накопленное и очищаем буфер — память не растёт с размером списка
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
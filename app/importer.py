@@ -0,0 +1,210 @@
+"""Потоковый импорт списка чтения из NDJSON / CSV
+
+Использование из командной строки:
+
+    python -m app.importer library.ndjson --user-id 1
+    python -m app.importer library.csv --user-id 1 --format csv --batch-size 2000
+
+Формат строк совпадает с выгрузкой GET /items/export.
+"""
+import argparse
+import codecs
+import csv
+import io
+import json
+import sys
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from time import perf_counter
+from typing import IO, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+
+from app.cache import response_cache
+from app.database import SessionLocal, insert_ignore
+from app.models import Item, Tag, User, item_tags
+from app.schemas.item import ItemImportRow
+from app.stats import apply_counters, item_counters
+from app.versioning import record_changes
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Сколько ошибок по строкам возвращать в отчёте
+MAX_REPORTED_ERRORS = 100
+
+
+def _text_lines(stream: IO) -> Iterator[str]:
+    """Строки из текстового или бинарного потока (бинарный читается как UTF-8)
+    
+    Бинарный поток декодируется построчно через codecs.iterdecode, а не TextIOWrapper:
+    тот требует readable() и т.п., которых нет у SpooledTemporaryFile (UploadFile.file) до Python 3.11.
+    """
+    if isinstance(stream, io.TextIOBase):
+        return iter(stream)
+    return codecs.iterdecode(stream, "utf-8-sig")
+
+
+def parse_ndjson(stream: IO) -> Iterator[dict]:
+    """Разбор NDJSON построчно; некорректная строка отдаётся как ошибка"""
+    for line in _text_lines(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            row = ValueError(f"invalid JSON: {exc.msg}")
+        yield row
+
+
+def parse_csv(stream: IO) -> Iterator[dict]:
+    """Разбор CSV с заголовком построчно"""
+    for row in csv.DictReader(_text_lines(stream)):
+        # Пустые ячейки CSV — отсутствующие значения
+        yield {key: value for key, value in row.items() if value not in ("", None)}
+
+
+PARSERS = {
+    "ndjson": parse_ndjson,
+    "csv": parse_csv,
+}
+
+
+class ImportAborted(Exception):
+    """Импорт невозможен целиком (например, пользователь не найден)"""
+
+
+def _validate(index: int, row, errors: list) -> Optional[ItemImportRow]:
+    if isinstance(row, Exception):
+        errors.append({"index": index, "detail": str(row)})
+        return None
+    try:
+        return ItemImportRow.model_validate(row)
+    except ValidationError as exc:
+        detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in exc.errors())
+        errors.append({"index": index, "detail": detail})
+        return None
+
+
+def _import_batch(db, user_id: int, batch: list[ItemImportRow]) -> int:
+    """Записать пачку: upsert тегов, вставка элементов и связей, журнал изменений. Возвращает число новых тегов"""
+    names = {name for row in batch for name in row.tags}
+    tags_created = 0
+    existing = {}
+    tag_ids = {}
+    if names:
+        existing = dict(db.execute(select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(names))).all())
+        missing = names - existing.keys()
+        insert_ignore(db, Tag.__table__, [{"user_id": user_id, "name": name} for name in sorted(missing)])
+        tag_ids = dict(db.execute(select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(names))).all())
+        tags_created = len(tag_ids) - len(existing)
+    
+    # У всех строк одинаковый набор колонок — один executemany на пачку
+    now = datetime.utcnow()
+    rows = []
+    for row in batch:
+        values = row.model_dump(exclude={"tags"})
+        values["created_at"] = values["created_at"] or now
+        values["updated_at"] = values["updated_at"] or values["created_at"]
+        rows.append({"user_id": user_id, **values})
+    
+    item_ids = list(db.scalars(insert(Item).returning(Item.id, sort_by_parameter_order=True), rows))
+    
+    links = [
+        {"item_id": item_id, "tag_id": tag_ids[name]}
+        for item_id, row in zip(item_ids, batch)
+        for name in dict.fromkeys(row.tags)
+    ]
+    if links:
+        db.execute(insert(item_tags), links)
+    
+    changes = Counter()
+    for row in batch:
+        changes.update(item_counters(user_id, row, [tag_ids[name] for name in dict.fromkeys(row.tags)]))
+    apply_counters(db, changes)
+    
+    new_tag_ids = [tag_id for name, tag_id in tag_ids.items() if name not in existing]
+    record_changes(db, user_id, items=item_ids, tags=new_tag_ids)
+    
+    return tags_created
+
+
+def import_items(rows: Iterable, user_id: int, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Импортировать строки пачками; каждая пачка — отдельная транзакция"""
+    started = perf_counter()
+    errors = []
+    imported = 0
+    failed = 0
+    tags_created = 0
+    
+    db = SessionLocal()
+    try:
+        if db.get(User, user_id) is None:
+            raise ImportAborted("User not found")
+        
+        numbered = enumerate(rows)
+        while True:
+            chunk = list(islice(numbered, batch_size))
+            if not chunk:
+                break
+            batch_errors = []
+            batch = [
+                valid for valid in (_validate(index, row, batch_errors) for index, row in chunk)
+                if valid is not None
+            ]
+            failed += len(batch_errors)
+            errors.extend(batch_errors[:max(0, MAX_REPORTED_ERRORS - len(errors))])
+            if not batch:
+                continue
+            tags_created += _import_batch(db, user_id, batch)
+            db.commit()
+            imported += len(batch)
+    finally:
+        db.close()
+        if imported:
+            response_cache.invalidate_user(user_id)
+    
+    elapsed = perf_counter() - started
+    return {
+        "imported": imported,
+        "failed": failed,
+        "tags_created": tags_created,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(imported / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Точка входа CLI"""
+    parser = argparse.ArgumentParser(prog="python -m app.importer", description="Импорт списка чтения из NDJSON/CSV")
+    parser.add_argument("path", help="Файл для импорта ('-' — stdin)")
+    parser.add_argument("--user-id", type=int, required=True, help="Пользователь, в чей список импортировать")
+    parser.add_argument("--format", choices=sorted(PARSERS), help="Формат (по умолчанию — по расширению файла)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Строк в одной транзакции")
+    args = parser.parse_args(argv)
+    
+    file_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        report = import_items(PARSERS[file_format](stream), args.user_id, args.batch_size)
+    except ImportAborted as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 1
+    finally:
+        stream.close()
+    
+    for error in report["errors"]:
+        print(f"[WARNING] Строка {error['index']}: {error['detail']}", file=sys.stderr)
+    print(
+        f"[SUCCESS] Импортировано {report['imported']} элементов "
+        f"(ошибок: {report['failed']}, новых тегов: {report['tags_created']}) "
+        f"за {report['elapsed_seconds']} с — {report['rows_per_second']} строк/с"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Инструментирование запросов: число SQL-запросов, время БД, обработчика и сериализации
+
+Статистика текущего запроса хранится в ContextVar: её видят и обработчики
+в threadpool, и хуки движка SQLAlchemy (см. app/database.py).
+"""
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from app.config import settings
+from app.metrics import metrics
+
+logger = logging.getLogger("app.requests")
+
+
+class RequestStats:
+    """Счётчики одного HTTP-запроса"""
+    
+    __slots__ = ("started", "queries", "db_seconds", "serialize_seconds", "response_started")
+    
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.response_started: Optional[float] = None
+    
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing (мс)"""
+        total = ((self.response_started or perf_counter()) - self.started) * 1000
+        db = self.db_seconds * 1000
+        serialize = self.serialize_seconds * 1000
+        handler = max(0.0, total - db - serialize)
+        return (
+            f'db;dur={db:.2f};desc="{self.queries} queries", '
+            f"handler;dur={handler:.2f}, serialize;dur={serialize:.2f}, total;dur={total:.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Статистика текущего запроса (None вне HTTP-запроса)"""
+    return _current_stats.get()
+
+
+@contextmanager
+def timed_serialization():
+    """Учесть время сериализации ответа"""
+    stats = _current_stats.get()
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.serialize_seconds += perf_counter() - started
+
+
+def record_query(statement: str, duration: float) -> None:
+    """Учесть выполненный SQL-запрос; медленные — в лог"""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += duration
+    if settings.slow_query_ms and duration * 1000 >= settings.slow_query_ms:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(duration * 1000, 2),
+            "statement": " ".join(statement.split())[:1000],
+        }, ensure_ascii=False))
+
+
+class RequestTimingMiddleware:
+    """ASGI middleware: Server-Timing в ответе, метрики и структурированный лог запроса"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status_code = 500
+        metrics.in_flight += 1
+        
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                stats.response_started = perf_counter()
+                if settings.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            metrics.in_flight -= 1
+            # Шаблон пути маршрута, а не сам путь — иначе число серий растёт с числом id
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"], getattr(route, "path", "unmatched"), status_code, perf_counter() - stats.started,
+            )
+            if settings.request_log:
+                logger.info(json.dumps({
+                    "event": "request",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((perf_counter() - stats.started) * 1000, 2),
+                    "db_ms": round(stats.db_seconds * 1000, 2),
+                    "serialize_ms": round(stats.serialize_seconds * 1000, 2),
+                    "queries": stats.queries,
+                }))
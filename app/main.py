@@ -1,38 +1,85 @@
 """Главный файл FastAPI приложения"""
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from fastapi.exceptions import RequestValidationError
-from sqlalchemy.exc import SQLAlchemyError
+from contextlib import asynccontextmanager
 
-from app.database import engine, Base
-from app.routers import items_router, tags_router
+from fastapi import FastAPI, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.cache import response_cache
+from app.database import async_engine, dispose_engines, engine, serving_engine
+from app.events import event_bus
+from app.instrumentation import RequestTimingMiddleware
+from app.metrics import metrics
+from app.serialization import FastJSONResponse
+from app.routers import items_router, tags_router, users_router, sync_router, events_router, make_async_router
 from app.config import settings
 
-# Создание таблиц в БД
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """При остановке: закрыть брокер событий и пулы соединений (graceful shutdown воркера)"""
+    yield
+    event_bus.close()
+    await dispose_engines()
+
 
 # Инициализация FastAPI приложения
 app = FastAPI(
     title="Reading List API",
     description="API для управления списком чтения (книги и статьи)",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
-# Подключение роутеров
-app.include_router(items_router)
-app.include_router(tags_router)
+# Server-Timing и структурированный лог запросов
+app.add_middleware(RequestTimingMiddleware)
+
+# Подключение роутеров (async-версии при ASYNC_DB=true)
+if settings.async_db:
+    app.include_router(make_async_router(items_router))
+    app.include_router(make_async_router(tags_router))
+    app.include_router(make_async_router(users_router))
+    app.include_router(make_async_router(sync_router))
+else:
+    app.include_router(items_router)
+    app.include_router(tags_router)
+    app.include_router(users_router)
+    app.include_router(sync_router)
+
+# Push-уведомления не обращаются к БД и одинаковы для обоих режимов
+app.include_router(events_router)
 
 
 # Обработчики ошибок
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Обработчик ошибок валидации"""
+    metrics.count_error("validation")
     return JSONResponse(
         status_code=422,
         content={
             "error": "Validation error",
             "message": str(exc),
-            "details": exc.errors(),
+            # ctx ошибок value_error содержит исключение — приводим к JSON, как FastAPI по умолчанию
+            "details": jsonable_encoder(exc.errors(), custom_encoder={Exception: str}),
+        },
+    )
+
+
+@app.exception_handler(IntegrityError)
+async def integrity_exception_handler(request: Request, exc: IntegrityError):
+    """Обработчик нарушений ограничений БД (внешние ключи, уникальность)"""
+    metrics.count_error("integrity")
+    return JSONResponse(
+        status_code=409,
+        content={
+            "error": "Integrity error",
+            "message": "The request conflicts with existing data or references a missing object",
         },
     )
 
@@ -40,6 +87,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Обработчик ошибок базы данных"""
+    metrics.count_error("database")
     return JSONResponse(
         status_code=500,
         content={
@@ -52,6 +100,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Обработчик общих ошибок"""
+    metrics.count_error("internal")
     return JSONResponse(
         status_code=500,
         content={
@@ -72,24 +121,57 @@ async def root():
         "endpoints": {
             "items": "/items",
             "tags": "/tags",
+            "users": "/users/{id}/stats",
+            "sync": "/sync",
+            "events": "/events",
         },
     }
 
 
+def _ping_sync_database() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _ping_database() -> None:
+    if async_engine is None:
+        await run_in_threadpool(_ping_sync_database)
+        return
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
 # Healthcheck
 @app.get("/health")
-async def health():
+async def health(db: bool = Query(False, description="Проверить доступность БД (readiness)")):
     """Проверка работоспособности сервиса"""
-    return {"status": "ok"}
+    if not db:
+        return {"status": "ok"}
+    try:
+        await _ping_database()
+    except SQLAlchemyError:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": "error"})
+    return {"status": "ok", "database": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Метрики в текстовом формате Prometheus"""
+    return PlainTextResponse(
+        metrics.render(serving_engine, response_cache, event_bus),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Счётчики попаданий/промахов кеша ответов"""
+    return response_cache.stats()
 
 
 if __name__ == "__main__":
-    import uvicorn
+    import sys
     
-    uvicorn.run(
-        "app.main:app",
-        host=settings.api_host,
-        port=settings.api_port,
-        reload=True,
-    )
-
+    from app.serve import main
+    
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Метрики в текстовом формате Prometheus (GET /metrics)
+
+Счётчики обновляются только из event loop (middleware и async-обработчики
+ошибок), поэтому блокировки не нужны; горячий путь — несколько операций со словарём.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+
+# Границы корзин гистограммы задержек, секунды
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "sum", "count")
+    
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class Metrics:
+    """Реестр метрик HTTP-запросов"""
+    
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.latency = defaultdict(_Histogram)
+        self.errors = defaultdict(int)
+        self.in_flight = 0
+    
+    def observe_request(self, method: str, route: str, status: int, duration: float) -> None:
+        self.requests[(method, route, status)] += 1
+        self.latency[(method, route)].observe(duration)
+    
+    def count_error(self, handler: str) -> None:
+        self.errors[handler] += 1
+    
+    def render(self, engine, response_cache, event_bus) -> str:
+        """Все метрики в формате text/plain; version=0.0.4"""
+        lines = [
+            "# HELP http_requests_total HTTP requests by route and status",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {value}")
+        
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency by route",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram.buckets):
+                cumulative += count
+                lines.append(
+                    f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}"
+                )
+            lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {histogram.sum}")
+            lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {histogram.count}")
+        
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests being processed",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_errors_total Errors by exception handler",
+            "# TYPE http_errors_total counter",
+        ]
+        for handler, value in sorted(self.errors.items()):
+            lines.append(f"http_errors_total{_labels(handler=handler)} {value}")
+        
+        # Пул соединений: у StaticPool/SingletonThreadPool (SQLite в памяти) этих счётчиков нет
+        pool = engine.pool
+        for name, method, help_text in (
+            ("db_pool_size", "size", "Configured pool size"),
+            ("db_pool_checked_out", "checkedout", "Connections currently checked out"),
+            ("db_pool_overflow", "overflow", "Connections opened above pool size"),
+            ("db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+        ):
+            if hasattr(pool, method):
+                # overflow() отрицателен, пока пул не заполнен до pool_size
+                value = max(0, getattr(pool, method)())
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        
+        cache = response_cache.stats()
+        lines += [
+            "# HELP response_cache_hits_total Response cache hits",
+            "# TYPE response_cache_hits_total counter",
+            f"response_cache_hits_total {cache['hits']}",
+            "# HELP response_cache_misses_total Response cache misses",
+            "# TYPE response_cache_misses_total counter",
+            f"response_cache_misses_total {cache['misses']}",
+            "# HELP response_cache_hit_ratio Response cache hit ratio",
+            "# TYPE response_cache_hit_ratio gauge",
+            f"response_cache_hit_ratio {cache['hit_ratio']}",
+            "# HELP event_subscribers Open SSE/WebSocket subscriptions on this worker",
+            "# TYPE event_subscribers gauge",
+            f"event_subscribers {event_bus.subscribers()}",
+            "# HELP events_published_total Change events published by this worker",
+            "# TYPE events_published_total counter",
+            f"events_published_total {event_bus.published}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
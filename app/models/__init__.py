@@ -3,6 +3,9 @@ from app.models.user import User
 from app.models.item import Item
 from app.models.tag import Tag
 from app.models.item_tag import item_tags
+from app.models.item_search import items_fts
+from app.models.user_stats import UserItemStat
+from app.models.sync_change import SyncChange
 
-__all__ = ["User", "Item", "Tag", "item_tags"]
+__all__ = ["User", "Item", "Tag", "item_tags", "items_fts", "UserItemStat", "SyncChange"]
 
@@ -1,6 +1,6 @@
 """Модель элемента списка чтения"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Computed, Integer, SmallInteger, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 
@@ -27,22 +27,46 @@ class ItemPriority(str, enum.Enum):
     HIGH = "high"
 
 
+# Числовой ранг приоритета для сортировки: enum хранится строкой (имя члена),
+# и строковое сравнение даёт неверный порядок HIGH < LOW < NORMAL
+PRIORITY_RANKS = {ItemPriority.LOW: 0, ItemPriority.NORMAL: 1, ItemPriority.HIGH: 2}
+
+PRIORITY_RANK_SQL = "CASE priority {} END".format(
+    " ".join(f"WHEN '{priority.name}' THEN {rank}" for priority, rank in PRIORITY_RANKS.items())
+)
+
+
 class Item(Base):
     """Элемент списка чтения (книга или статья)"""
     
     __tablename__ = "items"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(500), nullable=False)
     kind = Column(SQLEnum(ItemKind), nullable=False, index=True)
     status = Column(SQLEnum(ItemStatus), default=ItemStatus.PLANNED, nullable=False, index=True)
     priority = Column(SQLEnum(ItemPriority), default=ItemPriority.NORMAL, nullable=False, index=True)
+    # Вычисляется БД из priority — пишущему коду поддерживать его не нужно
+    priority_rank = Column(SmallInteger, Computed(PRIORITY_RANK_SQL), nullable=False)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Связи
     user = relationship("User", back_populates="items")
     tags = relationship("Tag", secondary="item_tags", back_populates="items")
+    
+    # Составные индексы под фильтры и сортировки list_items: «user_id = ? [AND status = ?]
+    # ORDER BY поле, id» читается по индексу без сортировки; они же покрывают поиск по user_id.
+    # Индексы (поле, id) — для списков без фильтра по пользователю.
+    __table_args__ = (
+        Index("ix_items_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_items_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_items_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        Index("ix_items_user_id_priority_rank_id", "user_id", "priority_rank", "id"),
+        Index("ix_items_created_at_id", "created_at", "id"),
+        Index("ix_items_updated_at_id", "updated_at", "id"),
+        Index("ix_items_priority_rank_id", "priority_rank", "id"),
+    )
 
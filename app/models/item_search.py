@@ -0,0 +1,71 @@
+"""Полнотекстовый индекс по Item.title / Item.notes"""
+from sqlalchemy import Table, Column, Integer, Text, MetaData, event, text
+
+from app.models.item import Item
+
+# Виртуальная таблица FTS5 (только SQLite). Отдельная MetaData — create_all
+# не должен пытаться создать её как обычную таблицу.
+items_fts = Table(
+    "items_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", Text),
+    Column("notes", Text),
+)
+
+# Выражение должно совпадать с запросом в app/search.py, иначе индекс не используется
+POSTGRES_SEARCH_VECTOR = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(notes, ''))"
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        title, notes, content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF title, notes ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, title, notes) VALUES ('delete', old.id, old.title, old.notes);
+        INSERT INTO items_fts(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+    END
+    """,
+]
+
+POSTGRES_SEARCH_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_items_search ON items USING GIN ({POSTGRES_SEARCH_VECTOR})",
+]
+
+
+def create_search_index(connection) -> None:
+    """Создать поисковый индекс для текущего диалекта (идемпотентно)"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_SEARCH_DDL
+    elif dialect == "postgresql":
+        statements = POSTGRES_SEARCH_DDL
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def rebuild_search_index(connection) -> None:
+    """Перестроить индекс по текущему содержимому items"""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("INSERT INTO items_fts(items_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(Item.__table__, "after_create")
+def _create_search_index_after_items(target, connection, **kw):
+    """Создавать индекс вместе с таблицей items (create_all)"""
+    create_search_index(connection)
@@ -1,5 +1,5 @@
 """M2M связь между Item и Tag"""
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 
 from app.database import Base
 
@@ -8,5 +8,7 @@ item_tags = Table(
     Base.metadata,
     Column("item_id", Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # PK (item_id, tag_id) не помогает поиску от тега — нужен обратный индекс
+    Index("ix_item_tags_tag_id_item_id", "tag_id", "item_id"),
 )
 
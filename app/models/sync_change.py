@@ -0,0 +1,25 @@
+"""Журнал изменений для дельта-синхронизации (GET /sync)"""
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
+
+from app.database import Base
+
+
+class SyncChange(Base):
+    """Последнее изменение объекта пользователя
+    
+    Одна строка на объект (item / tag): при каждой записи seq переписывается
+    новой версией данных пользователя (users.data_version), поэтому журнал
+    не растёт с числом правок. deleted — tombstone удалённого объекта.
+    """
+    
+    __tablename__ = "sync_changes"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entity = Column(String(8), primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False, server_default="0")
+    
+    __table_args__ = (
+        Index("ix_sync_changes_user_id_seq", "user_id", "seq", "entity", "entity_id"),
+    )
@@ -16,6 +16,11 @@ class User(Base):
     display_name = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    # Версия данных пользователя (items/tags): растёт при каждой записи,
+    # используется для ETag/Last-Modified списков
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+    data_modified_at = Column(DateTime, default=datetime.utcnow, nullable=True)
+    
     # Связи
     items = relationship("Item", back_populates="user", cascade="all, delete-orphan")
     tags = relationship("Tag", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,19 @@
+"""Счётчики элементов пользователя для GET /users/{id}/stats"""
+from sqlalchemy import Column, Integer, String, ForeignKey
+
+from app.database import Base
+
+
+class UserItemStat(Base):
+    """Число элементов пользователя с данным значением измерения
+    
+    dimension — status / kind / priority / tag; key — значение enum или id тега.
+    Обновляется в той же транзакции, что и запись элементов (app/stats.py).
+    """
+    
+    __tablename__ = "user_item_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    dimension = Column(String(16), primary_key=True)
+    key = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,77 @@
+"""Курсорная (keyset) пагинация"""
+import base64
+import json
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, row_id: int) -> str:
+    """Упаковать позицию (значение сортировки, id) в непрозрачный курсор"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif hasattr(value, "value"):
+        value = value.value
+    payload = json.dumps({"s": sort_by, "o": sort_order, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple[Any, int]:
+    """Распаковать курсор и проверить, что он выдан для той же сортировки
+    
+    Все поля сортировки NOT NULL, поэтому отсутствующее или null-значение —
+    признак испорченного курсора, а не пустой страницы.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, row_id = payload["v"], int(payload["id"])
+        if value is None or payload["s"] != sort_by or payload["o"] != sort_order:
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    """Восстановить datetime из значения курсора"""
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class CountCache:
+    """Небольшой in-process кеш общих количеств с TTL для режима total_mode=fast"""
+    
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: dict[Hashable, tuple[float, int]] = {}
+        self._lock = Lock()
+    
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, total = entry
+            if monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            return total
+    
+    def set(self, key: Hashable, total: int) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_size:
+                # Вытесняем самую старую запись (dict сохраняет порядок вставки)
+                del self._data[next(iter(self._data))]
+            self._data[key] = (monotonic(), total)
+
+
+count_cache = CountCache(ttl=settings.count_cache_ttl, max_size=settings.count_cache_size)
@@ -1,6 +1,10 @@
 """API роутеры"""
 from app.routers.items import router as items_router
 from app.routers.tags import router as tags_router
+from app.routers.users import router as users_router
+from app.routers.sync import router as sync_router
+from app.routers.events import router as events_router
+from app.routers.async_routes import make_async_router
 
-__all__ = ["items_router", "tags_router"]
+__all__ = ["items_router", "tags_router", "users_router", "sync_router", "events_router", "make_async_router"]
 
@@ -0,0 +1,56 @@
+"""Асинхронные версии роутеров (AsyncSession)
+
+Каждый эндпоинт синхронного роутера оборачивается в ``async def``, который
+получает ``AsyncSession`` и выполняет исходный обработчик через
+``AsyncSession.run_sync``: код обработчика остаётся общим, а ввод-вывод БД
+идёт через асинхронный драйвер, не занимая поток из threadpool.
+"""
+import inspect
+from functools import wraps
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+
+
+def _make_async_endpoint(endpoint):
+    """Обернуть синхронный обработчик с параметром db в async-эндпоинт"""
+    
+    @wraps(endpoint)
+    async def async_endpoint(**kwargs):
+        db: AsyncSession = kwargs.pop("db")
+        return await db.run_sync(lambda session: endpoint(**kwargs, db=session))
+    
+    signature = inspect.signature(endpoint)
+    params = [
+        param.replace(annotation=AsyncSession, default=Depends(get_async_db)) if name == "db" else param
+        for name, param in signature.parameters.items()
+    ]
+    async_endpoint.__signature__ = signature.replace(parameters=params)
+    return async_endpoint
+
+
+def make_async_router(router: APIRouter) -> APIRouter:
+    """Построить асинхронную копию роутера с теми же путями и схемами"""
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        endpoint = route.endpoint
+        if "db" in inspect.signature(endpoint).parameters:
+            endpoint = _make_async_endpoint(endpoint)
+        async_router.add_api_route(
+            route.path,
+            endpoint,
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            summary=route.summary,
+            description=route.description,
+            response_class=route.response_class,
+            name=route.name,
+        )
+    return async_router
@@ -0,0 +1,67 @@
+"""API endpoints push-уведомлений об изменениях (SSE и WebSocket)"""
+import asyncio
+
+from fastapi import APIRouter, Query, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.events import RESYNC, event_bus
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _sse(event: str, data: bytes) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+@router.get("")
+async def stream_events(user_id: int = Query(..., description="Пользователь")):
+    """Поток Server-Sent Events с изменениями данных пользователя
+    
+    event: change — id изменённых/удалённых объектов и новая версия (данные — через GET /sync),
+    event: resync — события пропущены, нужно догнать через GET /sync.
+    """
+    
+    subscription = event_bus.subscribe(user_id)
+    
+    async def stream():
+        try:
+            yield _sse("ready", b'{"user_id":%d}' % user_id)
+            while True:
+                message = await subscription.get(timeout=settings.events_heartbeat)
+                if message is None:
+                    yield b": keepalive\n\n"
+                else:
+                    yield _sse("resync" if message == RESYNC else "change", message)
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_events(websocket: WebSocket, subscription) -> None:
+    while True:
+        message = await subscription.get(timeout=settings.events_heartbeat)
+        await websocket.send_text('{"type":"ping"}' if message is None else message.decode())
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, user_id: int = Query(...)):
+    """Те же события через WebSocket: каждое сообщение — JSON-объект (type: change / resync / ping)"""
+    
+    await websocket.accept()
+    subscription = event_bus.subscribe(user_id)
+    # Отправка идёт в отдельной задаче, а здесь ждём закрытия соединения клиентом
+    sender = asyncio.create_task(_send_events(websocket, subscription))
+    try:
+        while not sender.done():
+            if (await websocket.receive())["type"] == "websocket.disconnect":
+                break
+    finally:
+        sender.cancel()
+        event_bus.unsubscribe(subscription)
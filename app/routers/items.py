@@ -1,26 +1,200 @@
 """API endpoints для работы с Items"""
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import Optional, Union
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, exists, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session, load_only, selectinload
 
-from app.database import get_db
-from app.models import Item, Tag
+from app.cache import response_cache
+from app.conditional import make_etag, is_not_modified, not_modified, set_validators
+from app.database import get_db, insert_ignore
+from app.export import export_csv, export_ndjson
+from app.importer import PARSERS, ImportAborted, import_items as run_import
+from app.models import Item, Tag, User, item_tags
+from app.models.item import PRIORITY_RANKS
+from app.search import apply_search
+from app.stats import apply_counters, item_counters
+from app.serialization import item_to_dict
+from app.versioning import record_changes
+from app.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, count_cache
 from app.schemas.item import (
     ItemCreate,
     ItemUpdate,
     ItemResponse,
     ItemListResponse,
+    ItemSparseResponse,
+    ItemSparseListResponse,
     ItemKind,
     ItemStatus,
     ItemPriority,
     ItemTagUpdate,
+    ItemBulkCreate,
+    ItemBulkUpdate,
+    ItemBulkDelete,
+    ItemBulkTag,
+    ItemBulkResponse,
+    ItemImportReport,
 )
 
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
+# Поля, которые можно запросить через fields= (id возвращается всегда)
+ITEM_FIELDS = ("title", "kind", "status", "priority", "notes", "user_id", "created_at", "updated_at")
+
+# Связи, которые можно встроить через include=
+ITEM_INCLUDES = ("tags",)
+
+
+def _items_query(db: Session, columns: Optional[list[str]] = None, with_tags: bool = True):
+    """Запрос Items: только нужные колонки и пакетная загрузка тегов (один SELECT на страницу)"""
+    query = db.query(Item)
+    if columns is not None:
+        query = query.options(load_only(*(getattr(Item, name) for name in columns)))
+    if with_tags:
+        query = query.options(selectinload(Item.tags))
+    return query
+
+
+def _load_item(db: Session, item_id: int) -> Optional[Item]:
+    """Загрузить элемент вместе с тегами"""
+    return _items_query(db).filter(Item.id == item_id).populate_existing().first()
+
+
+def _parse_fieldset(fields: Optional[str], include: Optional[str]) -> tuple[Optional[list[str]], bool]:
+    """Разобрать fields/include → (поля в порядке схемы или None — все, встраивать ли теги)
+    
+    Без обоих параметров ответ полный, с тегами. Если задан fields, теги
+    встраиваются только по include=tags.
+    """
+    fieldset = None
+    if fields is not None:
+        requested = {part.strip() for part in fields.split(",") if part.strip()}
+        unknown = requested - set(ITEM_FIELDS) - {"id"}
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        fieldset = [name for name in ITEM_FIELDS if name in requested]
+    
+    if include is None:
+        return fieldset, fields is None
+    included = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = included - set(ITEM_INCLUDES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    return fieldset, "tags" in included
+
+
+def _parse_id_list(raw: str, param: str) -> list[int]:
+    """Разобрать список id через запятую"""
+    try:
+        return sorted({int(part) for part in raw.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{param} must be a comma-separated list of integers")
+
+
+def _apply_tag_filters(query, tag_id_list: list[int], tag_match: str, exclude_tag_id_list: list[int]):
+    """Фильтрация по тегам через полусоединения (EXISTS / IN) без размножения строк"""
+    if tag_id_list:
+        if tag_match == "all":
+            # Tag-first поиск по индексу (tag_id, item_id): элементы, у которых есть все теги
+            matching = (
+                select(item_tags.c.item_id)
+                .where(item_tags.c.tag_id.in_(tag_id_list))
+                .group_by(item_tags.c.item_id)
+                .having(func.count() == len(tag_id_list))
+            )
+            query = query.filter(Item.id.in_(matching))
+        else:
+            query = query.filter(
+                exists().where(item_tags.c.item_id == Item.id, item_tags.c.tag_id.in_(tag_id_list))
+            )
+    
+    if exclude_tag_id_list:
+        query = query.filter(
+            ~exists().where(item_tags.c.item_id == Item.id, item_tags.c.tag_id.in_(exclude_tag_id_list))
+        )
+    
+    return query
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    """Краткое описание ошибки валидации строки"""
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in exc.errors())
+
+
+def _finish_bulk_write(db: Session, owners: dict[int, int], deleted: bool = False) -> None:
+    """Записать изменения в журнал, зафиксировать bulk-транзакцию и сбросить кеш
+    
+    owners — {id элемента: user_id} изменённых (или удалённых при deleted=True) элементов.
+    """
+    items_by_user = defaultdict(list)
+    for item_id, user_id in owners.items():
+        items_by_user[user_id].append(item_id)
+    # record_changes блокирует строку users до commit; единый порядок (по user_id, как и
+    # строки счётчиков в apply_counters) исключает взаимоблокировку параллельных bulk-запросов
+    for user_id, item_ids in sorted(items_by_user.items()):
+        if deleted:
+            record_changes(db, user_id, deleted_items=item_ids)
+        else:
+            record_changes(db, user_id, items=item_ids)
+    db.commit()
+    for user_id in items_by_user:
+        response_cache.invalidate_user(user_id)
+
+
+def _check_tag_owner(db: Session, user_id: int, tag_ids: list[int]) -> list[int]:
+    """Убедиться, что все теги принадлежат пользователю (400 иначе); вернуть id без повторов"""
+    tag_ids = list(dict.fromkeys(tag_ids))
+    if tag_ids:
+        found = db.scalar(select(func.count()).select_from(Tag).where(Tag.id.in_(tag_ids), Tag.user_id == user_id))
+        if found != len(tag_ids):
+            raise HTTPException(status_code=400, detail="Some tags not found or don't belong to user")
+    return tag_ids
+
+
+def _link_tags(db: Session, item_ids: list[int], tag_ids: list[int]) -> list[tuple[int, int]]:
+    """Один INSERT ... ON CONFLICT DO NOTHING RETURNING в item_tags; вернуть новые связи (item_id, tag_id)"""
+    rows = [{"item_id": item_id, "tag_id": tag_id} for item_id in item_ids for tag_id in tag_ids]
+    return [tuple(row) for row in insert_ignore(db, item_tags, rows, returning=(item_tags.c.item_id, item_tags.c.tag_id))]
+
+
+def _unlink_tags(db: Session, item_ids: list[int], condition) -> list[tuple[int, int]]:
+    """Один DELETE ... RETURNING из item_tags; вернуть удалённые связи (item_id, tag_id)"""
+    if not item_ids:
+        return []
+    return [
+        tuple(row)
+        for row in db.execute(
+            delete(item_tags)
+            .where(item_tags.c.item_id.in_(item_ids), condition)
+            .returning(item_tags.c.item_id, item_tags.c.tag_id)
+        )
+    ]
+
+
+def _finish_tag_write(
+    db: Session, owners: dict[int, int], added: list[tuple[int, int]], removed: list[tuple[int, int]],
+) -> None:
+    """Счётчики тегов, updated_at и журнал только для элементов, связи которых действительно изменились"""
+    changes = Counter()
+    for links, sign in ((added, 1), (removed, -1)):
+        for item_id, tag_id in links:
+            changes[(owners[item_id], "tag", str(tag_id))] += sign
+    changed = list(dict.fromkeys(item_id for item_id, _ in added + removed))
+    if not changed:
+        return
+    apply_counters(db, changes)
+    db.execute(
+        update(Item).where(Item.id.in_(changed)).values(updated_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False},
+    )
+    _finish_bulk_write(db, {item_id: owners[item_id] for item_id in changed})
+
+
 @router.post("", response_model=ItemResponse, status_code=201)
 def create_item(item: ItemCreate, db: Session = Depends(get_db)):
     """Создать новый элемент списка чтения"""
@@ -36,6 +210,7 @@ def create_item(item: ItemCreate, db: Session = Depends(get_db)):
     )
     
     # Добавляем теги если указаны
+    tags = []
     if item.tag_ids:
         tags = db.query(Tag).filter(
             Tag.id.in_(item.tag_ids),
@@ -44,42 +219,362 @@ def create_item(item: ItemCreate, db: Session = Depends(get_db)):
         db_item.tags = tags
     
     db.add(db_item)
+    db.flush()
+    apply_counters(db, item_counters(item.user_id, item, [tag.id for tag in tags]))
+    record_changes(db, item.user_id, items=[db_item.id])
     db.commit()
-    db.refresh(db_item)
+    response_cache.invalidate_user(item.user_id)
     
-    return {"data": db_item}
+    return {"data": _load_item(db, db_item.id)}
+
+
+@router.post("/bulk", response_model=ItemBulkResponse)
+def bulk_create_items(payload: ItemBulkCreate, db: Session = Depends(get_db)):
+    """Создать элементы пакетом в одной транзакции"""
+    
+    errors = []
+    valid = []
+    for index, row in enumerate(payload.items):
+        try:
+            valid.append((index, ItemCreate.model_validate(row)))
+        except ValidationError as exc:
+            errors.append({"index": index, "detail": _validation_detail(exc)})
+    
+    # Пользователи и теги всех строк — по одному запросу
+    user_ids = {item.user_id for _, item in valid}
+    known_users = set(db.scalars(select(User.id).where(User.id.in_(user_ids)))) if user_ids else set()
+    tag_ids = {tag_id for _, item in valid for tag_id in item.tag_ids or []}
+    tag_owners = dict(db.execute(select(Tag.id, Tag.user_id).where(Tag.id.in_(tag_ids))).all()) if tag_ids else {}
+    
+    rows = []
+    row_tags = []
+    for index, item in valid:
+        if item.user_id not in known_users:
+            errors.append({"index": index, "detail": "User not found"})
+            continue
+        item_tag_ids = sorted(set(item.tag_ids or []))
+        if any(tag_owners.get(tag_id) != item.user_id for tag_id in item_tag_ids):
+            errors.append({"index": index, "detail": "Some tags not found or don't belong to user"})
+            continue
+        rows.append(item.model_dump(exclude={"tag_ids"}))
+        row_tags.append(item_tag_ids)
+    
+    created_ids = []
+    if rows:
+        # executemany INSERT ... RETURNING; id возвращаются в порядке строк
+        created_ids = list(db.scalars(
+            insert(Item).returning(Item.id, sort_by_parameter_order=True),
+            rows,
+        ))
+        links = [
+            {"item_id": item_id, "tag_id": tag_id}
+            for item_id, item_tag_ids in zip(created_ids, row_tags)
+            for tag_id in item_tag_ids
+        ]
+        if links:
+            db.execute(insert(item_tags), links)
+        changes = Counter()
+        for row, item_tag_ids in zip(rows, row_tags):
+            changes.update(item_counters(row["user_id"], row, item_tag_ids))
+        apply_counters(db, changes)
+        _finish_bulk_write(db, {item_id: row["user_id"] for item_id, row in zip(created_ids, rows)})
+    
+    return {"data": created_ids, "errors": sorted(errors, key=lambda err: err["index"])}
+
+
+@router.patch("/bulk", response_model=ItemBulkResponse)
+def bulk_update_items(payload: ItemBulkUpdate, db: Session = Depends(get_db)):
+    """Обновить элементы пакетом в одной транзакции"""
+    
+    errors = []
+    valid = []
+    for index, row in enumerate(payload.items):
+        item_id = row.get("id")
+        if not isinstance(item_id, int):
+            errors.append({"index": index, "detail": "id: integer id is required"})
+            continue
+        try:
+            update_data = ItemUpdate.model_validate({k: v for k, v in row.items() if k != "id"})
+        except ValidationError as exc:
+            errors.append({"index": index, "id": item_id, "detail": _validation_detail(exc)})
+            continue
+        valid.append((index, item_id, update_data.model_dump(exclude_unset=True)))
+    
+    ids = {item_id for _, item_id, _ in valid}
+    current = {}
+    if ids:
+        # Текущие значения измерений — для пересчёта счётчиков статистики
+        for row in db.execute(
+            select(Item.id, Item.user_id, Item.status, Item.kind, Item.priority).where(Item.id.in_(ids))
+        ):
+            current[row.id] = row._asdict()
+    owners = {item_id: row["user_id"] for item_id, row in current.items()}
+    
+    now = datetime.utcnow()
+    rows = []
+    changes = Counter()
+    for index, item_id, update_data in valid:
+        if item_id not in owners:
+            errors.append({"index": index, "id": item_id, "detail": "Item not found"})
+            continue
+        rows.append({"id": item_id, **update_data, "updated_at": now})
+        before = current[item_id]
+        after = {**before, **update_data}
+        changes.update(item_counters(owners[item_id], before, sign=-1))
+        changes.update(item_counters(owners[item_id], after))
+        current[item_id] = after
+    
+    if rows:
+        # ORM bulk UPDATE по первичному ключу (executemany)
+        db.execute(update(Item), rows)
+        apply_counters(db, changes)
+        _finish_bulk_write(db, {row["id"]: owners[row["id"]] for row in rows})
+    
+    return {"data": [row["id"] for row in rows], "errors": sorted(errors, key=lambda err: err["index"])}
+
+
+@router.delete("/bulk", response_model=ItemBulkResponse)
+def bulk_delete_items(payload: ItemBulkDelete, db: Session = Depends(get_db)):
+    """Удалить элементы пакетом в одной транзакции"""
+    
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(Item.id, Item.user_id, Item.status, Item.kind, Item.priority).where(Item.id.in_(payload.ids))
+        )
+    }
+    owners = {item_id: row.user_id for item_id, row in current.items()}
+    errors = [
+        {"index": index, "id": item_id, "detail": "Item not found"}
+        for index, item_id in enumerate(payload.ids)
+        if item_id not in owners
+    ]
+    
+    deleted_ids = [item_id for item_id in dict.fromkeys(payload.ids) if item_id in owners]
+    if deleted_ids:
+        changes = Counter()
+        for item_id in deleted_ids:
+            changes.update(item_counters(owners[item_id], current[item_id], sign=-1))
+        for item_id, tag_id in db.execute(
+            select(item_tags.c.item_id, item_tags.c.tag_id).where(item_tags.c.item_id.in_(deleted_ids))
+        ):
+            changes[(owners[item_id], "tag", str(tag_id))] -= 1
+        apply_counters(db, changes)
+        db.execute(delete(item_tags).where(item_tags.c.item_id.in_(deleted_ids)))
+        db.execute(delete(Item).where(Item.id.in_(deleted_ids)))
+        _finish_bulk_write(db, {item_id: owners[item_id] for item_id in deleted_ids}, deleted=True)
+    
+    return {"data": deleted_ids, "errors": errors}
+
+
+def _bulk_tag_owners(db: Session, payload: ItemBulkTag, errors: list) -> dict[int, int]:
+    """{id: user_id} найденных элементов пакета; ненайденные попадают в errors"""
+    owners = dict(db.execute(select(Item.id, Item.user_id).where(Item.id.in_(payload.ids))).all())
+    errors.extend(
+        {"index": index, "id": item_id, "detail": "Item not found"}
+        for index, item_id in enumerate(payload.ids)
+        if item_id not in owners
+    )
+    return {item_id: owners[item_id] for item_id in dict.fromkeys(payload.ids) if item_id in owners}
 
 
-@router.get("/{item_id}", response_model=ItemResponse)
-def get_item(item_id: int, db: Session = Depends(get_db)):
+@router.post("/bulk/tags", response_model=ItemBulkResponse)
+def bulk_add_tags(payload: ItemBulkTag, db: Session = Depends(get_db)):
+    """Добавить теги к нескольким элементам одним INSERT в item_tags
+    
+    Теги должны принадлежать владельцу элемента, иначе элемент попадает в errors.
+    """
+    
+    errors = []
+    owners = _bulk_tag_owners(db, payload, errors)
+    tag_ids = list(dict.fromkeys(payload.tag_ids))
+    tag_owners = dict(db.execute(select(Tag.id, Tag.user_id).where(Tag.id.in_(tag_ids))).all())
+    if len(tag_owners) != len(tag_ids):
+        raise HTTPException(status_code=400, detail="Some tags not found")
+    
+    foreign = {
+        item_id for item_id, user_id in owners.items()
+        if any(tag_owner != user_id for tag_owner in tag_owners.values())
+    }
+    errors.extend(
+        {"index": index, "id": item_id, "detail": "Some tags don't belong to item owner"}
+        for index, item_id in enumerate(payload.ids)
+        if item_id in foreign
+    )
+    owners = {item_id: user_id for item_id, user_id in owners.items() if item_id not in foreign}
+    
+    _finish_tag_write(db, owners, _link_tags(db, list(owners), tag_ids), [])
+    
+    return {"data": list(owners), "errors": sorted(errors, key=lambda err: err["index"])}
+
+
+@router.delete("/bulk/tags", response_model=ItemBulkResponse)
+def bulk_remove_tags(payload: ItemBulkTag, db: Session = Depends(get_db)):
+    """Удалить теги у нескольких элементов одним DELETE из item_tags"""
+    
+    errors = []
+    owners = _bulk_tag_owners(db, payload, errors)
+    removed = _unlink_tags(db, list(owners), item_tags.c.tag_id.in_(payload.tag_ids))
+    _finish_tag_write(db, owners, [], removed)
+    
+    return {"data": list(owners), "errors": errors}
+
+
+@router.get("/export")
+def export_items(
+    user_id: int = Query(..., description="Пользователь, чей список выгружается"),
+    format: str = Query("ndjson", regex="^(ndjson|csv)$", description="Формат выгрузки"),
+    db: Session = Depends(get_db),
+):
+    """Потоковая выгрузка всего списка пользователя (NDJSON или CSV)
+    
+    Сессия get_db нужна только для проверки пользователя до начала ответа: строки
+    читаются в генераторе со своей сессией, ответ отдаётся уже после выхода из эндпоинта.
+    """
+    
+    if db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if format == "csv":
+        content, media_type = export_csv(user_id), "text/csv; charset=utf-8"
+    else:
+        content, media_type = export_ndjson(user_id), "application/x-ndjson"
+    
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="reading-list-{user_id}.{format}"'},
+    )
+
+
+@router.post("/import", response_model=ItemImportReport)
+def import_items(
+    user_id: int = Query(..., description="Пользователь, в чей список импортировать"),
+    format: str = Query("ndjson", regex="^(ndjson|csv)$", description="Формат файла"),
+    batch_size: int = Query(1000, ge=1, le=10000, description="Строк в одной транзакции"),
+    file: UploadFile = File(..., description="Файл NDJSON или CSV (формат как у /items/export)"),
+):
+    """Импорт списка чтения из файла: разбор потоком, запись пачками"""
+    
+    try:
+        return run_import(PARSERS[format](file.file), user_id, batch_size)
+    except ImportAborted as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+# С fields=/include= ответ неполный — схема ответа описывает оба варианта
+@router.get("/{item_id}", response_model=Union[ItemResponse, ItemSparseResponse])
+def get_item(
+    item_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description=f"Только эти поля через запятую: {', '.join(ITEM_FIELDS)}"),
+    include: Optional[str] = Query(None, description="Встроить связи: tags (по умолчанию — если fields не задан)"),
+    db: Session = Depends(get_db),
+):
     """Получить элемент по ID"""
     
-    db_item = db.query(Item).filter(Item.id == item_id).first()
+    fieldset, with_tags = _parse_fieldset(fields, include)
+    variant = f"{','.join(fieldset) if fieldset is not None else '*'};{'tags' if with_tags else ''}"
+    
+    # Валидаторы из одной колонки по PK — до загрузки элемента и тегов
+    updated_at = db.query(Item.updated_at).filter(Item.id == item_id).scalar()
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    etag = make_etag("item", item_id, updated_at.isoformat(), variant)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    # updated_at в ключе: тело из кеша всегда соответствует ETag, даже если запись
+    # прошла через другой воркер и локальная версия кеша ещё не сброшена
+    cache_key = response_cache.make_object_key("items:get", item_id, f"{variant};{updated_at.isoformat()}")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return set_validators(cached, etag, updated_at)
+    
+    # user_id нужен для ключа кеша, даже если не запрошен
+    columns = None if fieldset is None else [*fieldset, "user_id"]
+    db_item = _items_query(db, columns, with_tags).filter(Item.id == item_id).populate_existing().first()
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     
-    return {"data": db_item}
+    response = response_cache.store_object(
+        cache_key, "items:get", item_id, db_item.user_id, {"data": item_to_dict(db_item, fieldset, with_tags)},
+    )
+    return set_validators(response, etag, updated_at)
 
 
-@router.get("", response_model=ItemListResponse)
+@router.get("", response_model=Union[ItemListResponse, ItemSparseListResponse])
 def list_items(
+    request: Request,
     user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
     status: Optional[ItemStatus] = Query(None, description="Фильтр по статусу"),
     kind: Optional[ItemKind] = Query(None, description="Фильтр по типу"),
     priority: Optional[ItemPriority] = Query(None, description="Фильтр по приоритету"),
-    tag_ids: Optional[str] = Query(None, description="Фильтр по тегам (через запятую, любой из)"),
+    tag_ids: Optional[str] = Query(None, description="Фильтр по тегам (через запятую)"),
+    tag_match: str = Query("any", regex="^(any|all)$", description="any — любой из tag_ids, all — все tag_ids"),
+    exclude_tag_ids: Optional[str] = Query(None, description="Исключить элементы с любым из тегов (через запятую)"),
     title_contains: Optional[str] = Query(None, description="Поиск по подстроке в названии"),
+    q: Optional[str] = Query(None, description="Полнотекстовый поиск по названию и заметкам"),
     created_after: Optional[datetime] = Query(None, description="Создано после (ISO datetime)"),
     created_before: Optional[datetime] = Query(None, description="Создано до (ISO datetime)"),
-    sort_by: str = Query("created_at", regex="^(created_at|updated_at|priority)$", description="Поле сортировки"),
+    sort_by: Optional[str] = Query(
+        None,
+        regex="^(created_at|updated_at|priority|relevance)$",
+        description="Поле сортировки (по умолчанию relevance при q, иначе created_at)",
+    ),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Порядок сортировки"),
     limit: int = Query(50, ge=1, le=100, description="Количество записей"),
     offset: int = Query(0, ge=0, description="Смещение"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor из предыдущего ответа)"),
+    include_total: bool = Query(True, description="Возвращать общее количество записей"),
+    total_mode: str = Query(
+        "exact",
+        regex="^(exact|fast)$",
+        description="exact — отдельный COUNT; fast — оконная функция в том же запросе или кешированная оценка",
+    ),
+    fields: Optional[str] = Query(None, description=f"Только эти поля через запятую: {', '.join(ITEM_FIELDS)}"),
+    include: Optional[str] = Query(None, description="Встроить связи: tags (по умолчанию — если fields не задан)"),
     db: Session = Depends(get_db),
 ):
     """Получить список элементов с фильтрацией, пагинацией и сортировкой"""
     
-    query = db.query(Item)
+    fieldset, with_tags = _parse_fieldset(fields, include)
+    params = {
+        "status": status, "kind": kind, "priority": priority,
+        "tag_ids": tag_ids, "tag_match": tag_match, "exclude_tag_ids": exclude_tag_ids,
+        "title_contains": title_contains, "q": q,
+        "created_after": created_after, "created_before": created_before,
+        "sort_by": sort_by, "sort_order": sort_order, "limit": limit, "offset": offset,
+        "cursor": cursor, "include_total": include_total, "total_mode": total_mode,
+        "fields": fieldset, "include_tags": with_tags,
+    }
+    
+    # Для списка одного пользователя ETag строится из версии его данных и параметров
+    etag = last_modified = None
+    cache_params = params
+    if user_id is not None:
+        version = db.query(User.data_version, User.data_modified_at).filter(User.id == user_id).first()
+        if version is not None:
+            etag = make_etag("items", user_id, version.data_version, sorted(params.items()))
+            last_modified = version.data_modified_at
+            if is_not_modified(request, etag, last_modified):
+                return not_modified(etag, last_modified)
+            # Та же версия, что и в ETag: устаревшее тело не отдаётся с новым ETag
+            cache_params = {**params, "data_version": version.data_version}
+    
+    cache_key = response_cache.make_key("items:list", user_id, cache_params)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return set_validators(cached, etag, last_modified) if etag else cached
+    
+    if sort_by is None:
+        sort_by = "relevance" if q else "created_at"
+    
+    # Колонка сортировки нужна для next_cursor, даже если не запрошена
+    columns = None
+    if fieldset is not None:
+        columns = [*fieldset, sort_by] if sort_by != "relevance" else fieldset
+    query = _items_query(db, columns, with_tags)
     
     # Применяем фильтры
     if user_id is not None:
@@ -94,13 +589,21 @@ def list_items(
     if priority:
         query = query.filter(Item.priority == priority)
     
-    if tag_ids:
-        tag_id_list = [int(tid.strip()) for tid in tag_ids.split(",")]
-        query = query.join(Item.tags).filter(Tag.id.in_(tag_id_list))
+    if tag_ids or exclude_tag_ids:
+        query = _apply_tag_filters(
+            query,
+            _parse_id_list(tag_ids, "tag_ids") if tag_ids else [],
+            tag_match,
+            _parse_id_list(exclude_tag_ids, "exclude_tag_ids") if exclude_tag_ids else [],
+        )
     
     if title_contains:
         query = query.filter(Item.title.ilike(f"%{title_contains}%"))
     
+    rank = None
+    if q:
+        query, rank = apply_search(query, q, db.get_bind().dialect.name)
+    
     if created_after:
         query = query.filter(Item.created_at >= created_after)
     
@@ -108,26 +611,90 @@ def list_items(
         query = query.filter(Item.created_at <= created_before)
     
     # Подсчёт общего количества (до пагинации)
-    total = query.count()
-    
-    # Сортировка
-    order_column = getattr(Item, sort_by)
-    if sort_order == "desc":
-        order_column = order_column.desc()
+    total = None
+    total_kind = None
+    filtered_query = query
+    if include_total and total_mode == "exact":
+        total = query.count()
+        total_kind = "exact"
+    
+    # Сортировка (id — дополнительный ключ для стабильного порядка)
+    if sort_by == "relevance":
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor is not supported for sort_by=relevance")
+        if rank is not None:
+            query = query.order_by(rank)
+        query = query.order_by(Item.id.desc())
     else:
-        order_column = order_column.asc()
-    
-    query = query.order_by(order_column)
-    
-    # Пагинация
-    items = query.offset(offset).limit(limit).all()
+        # Приоритет сортируется по числовому рангу (high > normal > low)
+        sort_column = Item.priority_rank if sort_by == "priority" else getattr(Item, sort_by)
+        if sort_order == "desc":
+            query = query.order_by(sort_column.desc(), Item.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Item.id.asc())
+    
+    # Пагинация: по курсору (seek по (sort_column, id)) или по смещению
+    if cursor:
+        if offset:
+            raise HTTPException(status_code=400, detail="cursor and offset cannot be combined")
+        value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        if sort_by == "priority":
+            if not isinstance(value, str) or value not in {p.value for p in ItemPriority}:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            value = PRIORITY_RANKS[ItemPriority(value)]
+        else:
+            value = parse_cursor_datetime(value)
+        position = tuple_(sort_column, Item.id)
+        boundary = tuple_(literal(value, sort_column.type), last_id)
+        if sort_order == "desc":
+            query = query.filter(position < boundary)
+        else:
+            query = query.filter(position > boundary)
+    else:
+        query = query.offset(offset)
     
-    return {
-        "data": items,
+    # Берём на одну запись больше, чтобы узнать, есть ли следующая страница
+    query = query.limit(limit + 1)
+    count_key = (
+        user_id, status, kind, priority, tag_ids, tag_match, exclude_tag_ids,
+        title_contains, q, created_after, created_before,
+    )
+    if include_total and total_mode == "fast" and not cursor:
+        # COUNT(*) OVER () считается до LIMIT — общее количество в том же запросе
+        rows = query.add_columns(func.count().over()).all()
+        items = [row[0] for row in rows]
+        if rows:
+            total = rows[0][1]
+            total_kind = "exact"
+            count_cache.set(count_key, total)
+    else:
+        items = query.all()
+    
+    if include_total and total is None:
+        # Окно недоступно (курсор или страница за концом списка) — берём кеш
+        total = count_cache.get(count_key)
+        total_kind = "estimate"
+        if total is None:
+            total = filtered_query.count()
+            total_kind = "exact"
+            count_cache.set(count_key, total)
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        if sort_by != "relevance":
+            next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
+    
+    response = response_cache.store(cache_key, {
+        "data": [item_to_dict(item, fieldset, with_tags) for item in items],
         "total": total,
+        "total_kind": total_kind,
         "limit": limit,
         "offset": offset,
-    }
+        "next_cursor": next_cursor,
+    })
+    return set_validators(response, etag, last_modified) if etag else response
 
 
 @router.patch("/{item_id}", response_model=ItemResponse)
@@ -139,15 +706,19 @@ def update_item(item_id: int, item_update: ItemUpdate, db: Session = Depends(get
         raise HTTPException(status_code=404, detail="Item not found")
     
     # Обновляем только переданные поля
+    changes = item_counters(db_item.user_id, db_item, sign=-1)
     update_data = item_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_item, field, value)
+    changes.update(item_counters(db_item.user_id, db_item))
+    apply_counters(db, changes)
     
     db_item.updated_at = datetime.utcnow()
+    record_changes(db, db_item.user_id, items=[item_id])
     db.commit()
-    db.refresh(db_item)
+    response_cache.invalidate_user(db_item.user_id)
     
-    return {"data": db_item}
+    return {"data": _load_item(db, item_id)}
 
 
 @router.delete("/{item_id}", status_code=204)
@@ -158,55 +729,55 @@ def delete_item(item_id: int, db: Session = Depends(get_db)):
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     
+    user_id = db_item.user_id
+    tag_ids = db.scalars(select(item_tags.c.tag_id).where(item_tags.c.item_id == item_id)).all()
+    apply_counters(db, item_counters(user_id, db_item, tag_ids, sign=-1))
     db.delete(db_item)
+    record_changes(db, user_id, deleted_items=[item_id])
     db.commit()
+    response_cache.invalidate_user(user_id)
     
     return None
 
 
+def _item_owner(db: Session, item_id: int) -> int:
+    """user_id элемента (404, если элемента нет)"""
+    owner = db.scalar(select(Item.user_id).where(Item.id == item_id))
+    if owner is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return owner
+
+
 @router.post("/{item_id}/tags", response_model=ItemResponse)
 def add_tags_to_item(item_id: int, tag_update: ItemTagUpdate, db: Session = Depends(get_db)):
-    """Добавить теги к элементу"""
-    
-    db_item = db.query(Item).filter(Item.id == item_id).first()
-    if not db_item:
-        raise HTTPException(status_code=404, detail="Item not found")
+    """Добавить теги к элементу (уже привязанные пропускаются)"""
     
-    # Получаем теги пользователя
-    tags = db.query(Tag).filter(
-        Tag.id.in_(tag_update.tag_ids),
-        Tag.user_id == db_item.user_id
-    ).all()
+    owner = _item_owner(db, item_id)
+    tag_ids = _check_tag_owner(db, owner, tag_update.tag_ids)
+    _finish_tag_write(db, {item_id: owner}, _link_tags(db, [item_id], tag_ids), [])
     
-    if len(tags) != len(tag_update.tag_ids):
-        raise HTTPException(status_code=400, detail="Some tags not found or don't belong to user")
-    
-    # Добавляем теги (SQLAlchemy автоматически избегает дубликатов)
-    for tag in tags:
-        if tag not in db_item.tags:
-            db_item.tags.append(tag)
+    return {"data": _load_item(db, item_id)}
+
+
+@router.put("/{item_id}/tags", response_model=ItemResponse)
+def replace_item_tags(item_id: int, tag_update: ItemTagUpdate, db: Session = Depends(get_db)):
+    """Заменить теги элемента указанным набором (пустой список — снять все)"""
     
-    db_item.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_item)
+    owner = _item_owner(db, item_id)
+    tag_ids = _check_tag_owner(db, owner, tag_update.tag_ids)
+    removed = _unlink_tags(db, [item_id], item_tags.c.tag_id.not_in(tag_ids))
+    _finish_tag_write(db, {item_id: owner}, _link_tags(db, [item_id], tag_ids), removed)
     
-    return {"data": db_item}
+    return {"data": _load_item(db, item_id)}
 
 
 @router.delete("/{item_id}/tags", response_model=ItemResponse)
 def remove_tags_from_item(item_id: int, tag_update: ItemTagUpdate, db: Session = Depends(get_db)):
     """Удалить теги из элемента"""
     
-    db_item = db.query(Item).filter(Item.id == item_id).first()
-    if not db_item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    # Удаляем указанные теги
-    db_item.tags = [tag for tag in db_item.tags if tag.id not in tag_update.tag_ids]
-    
-    db_item.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_item)
+    owner = _item_owner(db, item_id)
+    removed = _unlink_tags(db, [item_id], item_tags.c.tag_id.in_(tag_update.tag_ids))
+    _finish_tag_write(db, {item_id: owner}, [], removed)
     
-    return {"data": db_item}
+    return {"data": _load_item(db, item_id)}
 
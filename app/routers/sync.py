@@ -0,0 +1,78 @@
+"""API endpoint дельта-синхронизации"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import get_db
+from app.models import Item, SyncChange, Tag, User
+from app.schemas.sync import SyncResponse
+from app.serialization import item_to_dict, tag_to_dict
+from app.sync import decode_sync_token, encode_sync_token
+
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+def sync_changes(
+    user_id: int = Query(..., description="Пользователь"),
+    since: Optional[str] = Query(None, description="Токен next_since из предыдущего ответа (без него — всё с начала)"),
+    limit: int = Query(500, ge=1, le=5000, description="Максимум изменений в пакете"),
+    db: Session = Depends(get_db),
+):
+    """Изменения items/tags пользователя после токена since
+    
+    Элементы возвращаются целиком вместе с тегами (связи item ↔ tag), удалённые
+    объекты — списками id. Пока has_more, нужно повторять запрос с next_since.
+    """
+    
+    version = db.execute(select(User.data_version).where(User.id == user_id)).scalar_one_or_none()
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    query = select(SyncChange).where(SyncChange.user_id == user_id)
+    if since:
+        position = decode_sync_token(since)
+        if position[0] > version:
+            raise HTTPException(status_code=410, detail="Sync token is ahead of server data, full resync required")
+        query = query.where(tuple_(SyncChange.seq, SyncChange.entity, SyncChange.entity_id) > position)
+    changes = db.execute(
+        query.order_by(SyncChange.seq, SyncChange.entity, SyncChange.entity_id).limit(limit + 1)
+    ).scalars().all()
+    
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    changed = {"item": [], "tag": []}
+    deleted = {"item": [], "tag": []}
+    for change in changes:
+        (deleted if change.deleted else changed)[change.entity].append(change.entity_id)
+    
+    items = []
+    if changed["item"]:
+        loaded = db.query(Item).options(selectinload(Item.tags)).filter(Item.id.in_(changed["item"])).all()
+        by_id = {item.id: item for item in loaded}
+        items = [item_to_dict(by_id[item_id]) for item_id in changed["item"] if item_id in by_id]
+    tags = []
+    if changed["tag"]:
+        loaded = db.execute(select(Tag).where(Tag.id.in_(changed["tag"]))).scalars().all()
+        by_id = {tag.id: tag for tag in loaded}
+        tags = [tag_to_dict(by_id[tag_id]) for tag_id in changed["tag"] if tag_id in by_id]
+    
+    if changes:
+        last = changes[-1]
+        since = encode_sync_token(last.seq, last.entity, last.entity_id)
+    
+    return {
+        "data": {
+            "items": items,
+            "tags": tags,
+            "deleted_items": deleted["item"],
+            "deleted_tags": deleted["tag"],
+            "version": version,
+            "next_since": since,
+            "has_more": has_more,
+        }
+    }
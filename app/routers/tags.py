@@ -1,10 +1,18 @@
 """API endpoints для работы с Tags"""
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, case, func, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from app.cache import response_cache
 from app.database import get_db
-from app.models import Tag
+from app.models import Item, Tag, item_tags
+from app.models.item import ItemStatus
+from app.pagination import encode_cursor, decode_cursor
+from app.serialization import tag_to_dict
+from app.stats import forget_tag
+from app.versioning import record_changes
 from app.schemas.tag import TagCreate, TagResponse, TagListResponse
 
 
@@ -29,8 +37,11 @@ def create_tag(tag: TagCreate, db: Session = Depends(get_db)):
     
     db_tag = Tag(user_id=tag.user_id, name=tag.name)
     db.add(db_tag)
+    db.flush()
+    record_changes(db, tag.user_id, tags=[db_tag.id])
     db.commit()
     db.refresh(db_tag)
+    response_cache.invalidate_user(tag.user_id)
     
     return {"data": db_tag}
 
@@ -39,32 +50,110 @@ def create_tag(tag: TagCreate, db: Session = Depends(get_db)):
 def list_tags(
     user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
     name_contains: Optional[str] = Query(None, description="Поиск по подстроке в имени"),
+    include_counts: bool = Query(False, description="Добавить число элементов с тегом (count)"),
+    counts_by_status: bool = Query(False, description="Добавить разбивку count по статусу (by_status)"),
+    sort_by: str = Query("name", regex="^(name|popularity)$", description="name — по имени, popularity — по числу элементов (по убыванию)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Размер страницы (без limit — все теги)"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor)"),
     db: Session = Depends(get_db),
 ):
-    """Получить список тегов с фильтрацией"""
+    """Получить список тегов с фильтрацией, количеством элементов и курсорной пагинацией
     
-    query = db.query(Tag)
+    Количества считаются одним агрегатным запросом по item_tags
+    (индекс ix_item_tags_tag_id_item_id), popularity требует include_counts.
+    """
     
-    if user_id is not None:
-        query = query.filter(Tag.user_id == user_id)
+    include_counts = include_counts or counts_by_status or sort_by == "popularity"
+    sort_order = "desc" if sort_by == "popularity" else "asc"
+    
+    cache_key = response_cache.make_key("tags:list", user_id, {
+        "name_contains": name_contains,
+        "include_counts": include_counts,
+        "counts_by_status": counts_by_status,
+        "sort_by": sort_by,
+        "limit": limit,
+        "cursor": cursor,
+    })
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
+    filters = []
+    if user_id is not None:
+        filters.append(Tag.user_id == user_id)
     if name_contains:
-        query = query.filter(Tag.name.ilike(f"%{name_contains}%"))
+        filters.append(Tag.name.ilike(f"%{name_contains}%"))
+    
+    columns = [Tag.id, Tag.name, Tag.user_id]
+    query = select(*columns).where(*filters)
+    count = None
+    if include_counts:
+        count = func.count(item_tags.c.item_id).label("item_count")
+        query = (
+            select(*columns, count)
+            .outerjoin(item_tags, item_tags.c.tag_id == Tag.id)
+            .where(*filters)
+            .group_by(*columns)
+        )
+        if counts_by_status:
+            query = query.add_columns(*(
+                func.count(case((Item.status == status, 1))).label(status.value) for status in ItemStatus
+            )).outerjoin(Item, Item.id == item_tags.c.item_id)
+    
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        expected_type = int if sort_by == "popularity" else str
+        if not isinstance(value, expected_type) or isinstance(value, bool):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if sort_by == "popularity":
+            query = query.having(or_(count < value, and_(count == value, Tag.id > last_id)))
+        else:
+            query = query.where(tuple_(Tag.name, Tag.id) > (value, last_id))
     
-    tags = query.order_by(Tag.name).all()
+    order = (count.desc(), Tag.id) if sort_by == "popularity" else (Tag.name, Tag.id)
+    query = query.order_by(*order)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = db.execute(query).all()
     
-    return {"data": tags, "total": len(tags)}
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, last.item_count if sort_by == "popularity" else last.name, last.id)
+    
+    # Без пагинации и cursor total = число строк, иначе — отдельный COUNT по tags
+    if limit is None and not cursor:
+        total = len(rows)
+    else:
+        total = db.scalar(select(func.count()).select_from(Tag).where(*filters))
+    
+    data = []
+    for row in rows:
+        tag = tag_to_dict(row)
+        if include_counts:
+            tag["count"] = row.item_count
+        if counts_by_status:
+            tag["by_status"] = {status.value: row._mapping[status.value] for status in ItemStatus}
+        data.append(tag)
+    
+    return response_cache.store(cache_key, {"data": data, "total": total, "limit": limit, "next_cursor": next_cursor})
 
 
 @router.get("/{tag_id}", response_model=TagResponse)
 def get_tag(tag_id: int, db: Session = Depends(get_db)):
     """Получить тег по ID"""
     
+    cache_key = response_cache.make_object_key("tags:get", tag_id)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     db_tag = db.query(Tag).filter(Tag.id == tag_id).first()
     if not db_tag:
         raise HTTPException(status_code=404, detail="Tag not found")
     
-    return {"data": db_tag}
+    return response_cache.store_object(cache_key, "tags:get", tag_id, db_tag.user_id, {"data": tag_to_dict(db_tag)})
 
 
 @router.delete("/{tag_id}", status_code=204)
@@ -75,8 +164,16 @@ def delete_tag(tag_id: int, db: Session = Depends(get_db)):
     if not db_tag:
         raise HTTPException(status_code=404, detail="Tag not found")
     
+    user_id = db_tag.user_id
+    # У элементов с этим тегом меняется список тегов — обновляем их ETag и журнал синхронизации
+    item_ids = db.scalars(select(item_tags.c.item_id).where(item_tags.c.tag_id == tag_id)).all()
+    if item_ids:
+        db.execute(update(Item).where(Item.id.in_(item_ids)).values(updated_at=datetime.utcnow()))
     db.delete(db_tag)
+    forget_tag(db, user_id, tag_id)
+    record_changes(db, user_id, items=item_ids, deleted_tags=[tag_id])
     db.commit()
+    response_cache.invalidate_user(user_id)
     
     return None
 
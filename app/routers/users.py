@@ -0,0 +1,61 @@
+"""API endpoints для работы с Users"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import Tag, User, UserItemStat
+from app.models.item import ItemKind, ItemPriority, ItemStatus
+from app.schemas.user import UserStatsResponse
+
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.get("/{user_id}/stats", response_model=UserStatsResponse)
+def get_user_stats(user_id: int, db: Session = Depends(get_db)):
+    """Количество элементов по статусу, типу, приоритету и тегам
+    
+    Читается из таблицы счётчиков user_item_stats, которая обновляется при каждой записи.
+    """
+    
+    if db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    counters = db.execute(
+        select(UserItemStat.dimension, UserItemStat.key, UserItemStat.count)
+        .where(UserItemStat.user_id == user_id, UserItemStat.count > 0)
+    ).all()
+    
+    stats = {
+        "status": dict.fromkeys((status.value for status in ItemStatus), 0),
+        "kind": dict.fromkeys((kind.value for kind in ItemKind), 0),
+        "priority": dict.fromkeys((priority.value for priority in ItemPriority), 0),
+    }
+    tag_counts = {}
+    for dimension, key, count in counters:
+        if dimension == "tag":
+            tag_counts[int(key)] = count
+        elif dimension in stats:
+            stats[dimension][key] = count
+    
+    tag_names = dict(db.execute(select(Tag.id, Tag.name).where(Tag.id.in_(tag_counts))).all()) if tag_counts else {}
+    by_tag = sorted(
+        (
+            {"id": tag_id, "name": tag_names[tag_id], "count": count}
+            for tag_id, count in tag_counts.items()
+            if tag_id in tag_names
+        ),
+        key=lambda tag: (-tag["count"], tag["name"]),
+    )
+    
+    return {
+        "data": {
+            "user_id": user_id,
+            "total": sum(stats["status"].values()),
+            "by_status": stats["status"],
+            "by_kind": stats["kind"],
+            "by_priority": stats["priority"],
+            "by_tag": by_tag,
+        }
+    }
@@ -1,31 +1,54 @@
 """Pydantic схемы для API"""
-from app.schemas.user import User, UserCreate, UserResponse
-from app.schemas.tag import Tag, TagCreate, TagResponse
+from app.schemas.user import User, UserCreate, UserResponse, UserStats, UserStatsResponse
+from app.schemas.tag import Tag, TagCreate, TagResponse, TagListResponse, TagWithCount
 from app.schemas.item import (
     Item,
     ItemCreate,
     ItemUpdate,
     ItemResponse,
     ItemListResponse,
+    ItemSparse,
+    ItemSparseResponse,
+    ItemSparseListResponse,
     ItemKind,
     ItemStatus,
     ItemPriority,
+    ItemBulkCreate,
+    ItemBulkUpdate,
+    ItemBulkDelete,
+    ItemBulkTag,
+    ItemBulkResponse,
 )
+from app.schemas.sync import SyncBatch, SyncResponse
 
 __all__ = [
     "User",
     "UserCreate",
     "UserResponse",
+    "UserStats",
+    "UserStatsResponse",
     "Tag",
     "TagCreate",
     "TagResponse",
+    "TagListResponse",
+    "TagWithCount",
     "Item",
     "ItemCreate",
     "ItemUpdate",
     "ItemResponse",
     "ItemListResponse",
+    "ItemSparse",
+    "ItemSparseResponse",
+    "ItemSparseListResponse",
     "ItemKind",
     "ItemStatus",
     "ItemPriority",
+    "ItemBulkCreate",
+    "ItemBulkUpdate",
+    "ItemBulkDelete",
+    "ItemBulkTag",
+    "ItemBulkResponse",
+    "SyncBatch",
+    "SyncResponse",
 ]
 
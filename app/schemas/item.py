@@ -1,7 +1,7 @@
 """Схемы для Item"""
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 from app.schemas.tag import Tag
@@ -49,6 +49,14 @@ class ItemUpdate(BaseModel):
     status: Optional[ItemStatus] = None
     priority: Optional[ItemPriority] = None
     notes: Optional[str] = None
+    
+    @field_validator("title", "kind", "status", "priority")
+    @classmethod
+    def reject_null(cls, value):
+        """Поле можно не передавать, но явный null для NOT NULL колонки — ошибка (а не 409 при записи)"""
+        if value is None:
+            raise ValueError("may be omitted but cannot be null")
+        return value
 
 
 class Item(ItemBase):
@@ -70,12 +78,112 @@ class ItemResponse(BaseModel):
 class ItemListResponse(BaseModel):
     """Ответ со списком элементов"""
     data: list[Item]
-    total: int
+    total: Optional[int] = None
+    total_kind: Optional[Literal["exact", "estimate"]] = None
+    limit: int
+    offset: int
+    next_cursor: Optional[str] = None
+
+
+class ItemSparse(BaseModel):
+    """Элемент при запросе с fields=/include=: id всегда, остальные поля — только запрошенные"""
+    id: int
+    title: Optional[str] = None
+    kind: Optional[ItemKind] = None
+    status: Optional[ItemStatus] = None
+    priority: Optional[ItemPriority] = None
+    notes: Optional[str] = None
+    user_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    tags: Optional[list[Tag]] = None
+
+
+class ItemSparseResponse(BaseModel):
+    """Ответ с элементом при fields=/include="""
+    data: ItemSparse
+
+
+class ItemSparseListResponse(BaseModel):
+    """Ответ со списком элементов при fields=/include="""
+    data: list[ItemSparse]
+    total: Optional[int] = None
+    total_kind: Optional[Literal["exact", "estimate"]] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class ItemTagUpdate(BaseModel):
     """Схема для добавления/удаления тегов"""
     tag_ids: list[int]
 
+
+
+# Максимальное число строк в одном bulk-запросе
+BULK_MAX_ITEMS = 1000
+
+
+class ItemBulkCreate(BaseModel):
+    """Пакетное создание: каждая строка валидируется как ItemCreate"""
+    items: list[dict[str, Any]] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class ItemBulkUpdate(BaseModel):
+    """Пакетное обновление: каждая строка — id и поля ItemUpdate"""
+    items: list[dict[str, Any]] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class ItemBulkDelete(BaseModel):
+    """Пакетное удаление по id"""
+    ids: list[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class ItemBulkTag(BaseModel):
+    """Пакетное добавление/удаление тегов у элементов"""
+    ids: list[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    tag_ids: list[int] = Field(..., min_length=1)
+
+
+class ItemBulkError(BaseModel):
+    """Ошибка в отдельной строке bulk-запроса"""
+    index: int
+    id: Optional[int] = None
+    detail: str
+
+
+class ItemBulkResponse(BaseModel):
+    """Результат bulk-операции: id обработанных элементов и ошибки по строкам"""
+    data: list[int]
+    errors: list[ItemBulkError]
+
+
+class ItemImportRow(ItemBase):
+    """Строка импорта (формат совпадает с выгрузкой /items/export)"""
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    tags: list[str] = []
+    
+    @field_validator("tags", mode="before")
+    @classmethod
+    def normalize_tags(cls, value):
+        """Теги: список имён, список объектов {"name": ...} или строка 'a;b' из CSV"""
+        if value is None or value == "":
+            return []
+        if isinstance(value, str):
+            value = value.split(";")
+        names = [tag.get("name") if isinstance(tag, dict) else tag for tag in value]
+        names = [name.strip() for name in names if isinstance(name, str) and name.strip()]
+        if any(len(name) > 100 for name in names):
+            raise ValueError("tag name must be at most 100 characters")
+        return names
+
+
+class ItemImportReport(BaseModel):
+    """Итог импорта"""
+    imported: int
+    failed: int
+    tags_created: int
+    errors: list[ItemBulkError]
+    elapsed_seconds: float
+    rows_per_second: float
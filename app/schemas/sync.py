@@ -0,0 +1,23 @@
+"""Pydantic схемы для дельта-синхронизации"""
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.item import Item
+from app.schemas.tag import Tag
+
+
+class SyncBatch(BaseModel):
+    """Пакет изменений после токена since"""
+    items: list[Item]
+    tags: list[Tag]
+    deleted_items: list[int]
+    deleted_tags: list[int]
+    version: int
+    next_since: Optional[str]
+    has_more: bool
+
+
+class SyncResponse(BaseModel):
+    """Ответ GET /sync"""
+    data: SyncBatch
@@ -1,4 +1,6 @@
 """Схемы для Tag"""
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -25,8 +27,16 @@ class TagResponse(BaseModel):
     data: Tag
 
 
+class TagWithCount(Tag):
+    """Тег в списке: при include_counts — число элементов (и разбивка по статусу)"""
+    count: Optional[int] = None
+    by_status: Optional[dict[str, int]] = None
+
+
 class TagListResponse(BaseModel):
     """Ответ со списком тегов"""
-    data: list[Tag]
+    data: list[TagWithCount]
     total: int
+    limit: Optional[int] = None
+    next_cursor: Optional[str] = None
 
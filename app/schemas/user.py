@@ -26,3 +26,25 @@ class UserResponse(BaseModel):
     """Ответ с данными пользователя"""
     data: User
 
+
+
+class UserTagCount(BaseModel):
+    """Число элементов с тегом"""
+    id: int
+    name: str
+    count: int
+
+
+class UserStats(BaseModel):
+    """Сводка по списку чтения пользователя"""
+    user_id: int
+    total: int
+    by_status: dict[str, int]
+    by_kind: dict[str, int]
+    by_priority: dict[str, int]
+    by_tag: list[UserTagCount]
+
+
+class UserStatsResponse(BaseModel):
+    """Ответ со статистикой пользователя"""
+    data: UserStats
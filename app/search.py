@@ -0,0 +1,48 @@
+"""Полнотекстовый поиск по элементам списка чтения"""
+import re
+
+from sqlalchemy import func, literal_column, or_, select
+
+from app.models import Item
+from app.models.item_search import items_fts
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts5_query(q: str) -> str:
+    """Преобразовать пользовательский ввод в безопасный запрос FTS5 (все слова, по префиксу)"""
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(q))
+
+
+def apply_search(query, q: str, dialect: str):
+    """Отфильтровать запрос по q; возвращает (query, выражение ранга для ORDER BY)"""
+    if dialect == "sqlite":
+        fts_query = _fts5_query(q)
+        if not fts_query:
+            return query.filter(Item.id.is_(None)), None
+        # bm25 вычисляется в отдельном CTE: вспомогательные функции FTS5 нельзя
+        # использовать в одном SELECT с оконными функциями (total_mode=fast).
+        # MATERIALIZED не даёт планировщику развернуть CTE во вложенный цикл,
+        # где MATCH повторялся бы для каждой строки items (катастрофично для COUNT)
+        matches = (
+            select(items_fts.c.rowid.label("item_id"), func.bm25(literal_column("items_fts")).label("score"))
+            .where(literal_column("items_fts").op("MATCH")(fts_query))
+            .cte("search_matches")
+            .prefix_with("MATERIALIZED")
+        )
+        query = query.join(matches, matches.c.item_id == Item.id)
+        # bm25: чем меньше, тем релевантнее
+        return query, matches.c.score.asc()
+    
+    if dialect == "postgresql":
+        vector = func.to_tsvector(
+            "simple",
+            func.coalesce(Item.title, "").op("||")(" ").op("||")(func.coalesce(Item.notes, "")),
+        )
+        ts_query = func.websearch_to_tsquery("simple", q)
+        query = query.filter(vector.op("@@")(ts_query))
+        return query, func.ts_rank(vector, ts_query).desc()
+    
+    # Прочие диалекты — без индекса, подстрока в названии или заметках
+    pattern = f"%{q}%"
+    return query.filter(or_(Item.title.ilike(pattern), Item.notes.ilike(pattern))), None
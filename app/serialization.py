@@ -0,0 +1,70 @@
+"""Быстрая сериализация ответов на чтение
+
+Данные только что прочитаны из нашей БД, поэтому повторная валидация Pydantic
+не нужна: словари собираются напрямую из ORM-объектов в порядке полей схем
+(app/schemas), а JSON рендерится orjson. Без orjson используется стандартный json.
+"""
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """JSON в байтах (компактный, UTF-8 без экранирования — как model_dump_json)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse с рендерингом через dumps"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def tag_to_dict(tag) -> dict:
+    """Tag (ORM) → словарь по схеме app.schemas.Tag"""
+    return {"name": tag.name, "id": tag.id, "user_id": tag.user_id}
+
+
+def item_to_dict(item, fields: Optional[list[str]] = None, with_tags: bool = True) -> dict:
+    """Item (ORM) → словарь по схеме app.schemas.Item
+    
+    fields — подмножество полей (id включается всегда); обращаться можно
+    только к загруженным колонкам, иначе ORM выполнит запрос на каждую строку.
+    """
+    if fields is None:
+        data = {
+            "title": item.title,
+            "kind": item.kind.value,
+            "status": item.status.value,
+            "priority": item.priority.value,
+            "notes": item.notes,
+            "id": item.id,
+            "user_id": item.user_id,
+            "created_at": item.created_at,
+            "updated_at": item.updated_at,
+        }
+    else:
+        data = {"id": item.id}
+        for name in fields:
+            value = getattr(item, name)
+            data[name] = value.value if isinstance(value, Enum) else value
+    if with_tags:
+        data["tags"] = [tag_to_dict(tag) for tag in item.tags]
+    return data
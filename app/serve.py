@@ -0,0 +1,106 @@
+"""Production-запуск API
+
+    python -m app.serve                 # подготовка БД + воркеры по числу CPU
+    python -m app.serve --workers 4
+    python -m app.serve --init-only     # только подготовка БД (одноразовый шаг деплоя)
+    python -m app.serve --reload        # разработка: один процесс с перезапуском при правках
+
+Схема БД готовится один раз в родительском процессе до запуска воркеров
+(DB_INIT), поэтому воркеры не выполняют DDL при импорте и стартуют быстро.
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+
+from app.config import settings
+
+logger = logging.getLogger("app.serve")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DB_INIT_MODES = ("migrate", "create_all", "none")
+
+
+def init_database(mode: str) -> None:
+    """Подготовить схему БД: alembic upgrade head, create_all или ничего"""
+    if mode == "create_all":
+        from app.database import init_db
+        
+        init_db()
+    elif mode == "migrate":
+        from alembic import command
+        from alembic.config import Config
+        
+        config = Config(str(PROJECT_ROOT / "alembic.ini"))
+        config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+        command.upgrade(config, "head")
+    elif mode != "none":
+        raise ValueError(f"Unknown DB_INIT mode '{mode}', expected one of: {', '.join(DB_INIT_MODES)}")
+
+
+def resolve_workers(workers: int) -> int:
+    """Число воркеров: 0 — по числу CPU, доступных процессу"""
+    if workers > 0:
+        return workers
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _fastest(module: str, fallback: str) -> str:
+    """uvloop/httptools, если установлены (uvicorn[standard]), иначе стандартные реализации"""
+    return module if importlib.util.find_spec(module) is not None else fallback
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Точка входа: подготовка БД и запуск uvicorn"""
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Запуск Reading List API")
+    parser.add_argument("--host", default=settings.api_host)
+    parser.add_argument("--port", type=int, default=settings.api_port)
+    parser.add_argument("--workers", type=int, default=settings.server_workers, help="0 — по числу CPU")
+    parser.add_argument("--db-init", choices=DB_INIT_MODES, default=settings.db_init, help="Подготовка схемы БД")
+    parser.add_argument("--init-only", action="store_true", help="Только подготовить БД и выйти")
+    parser.add_argument("--reload", action="store_true", help="Режим разработки: один процесс, перезапуск при правках")
+    args = parser.parse_args(argv)
+    
+    init_database(args.db_init)
+    if args.init_only:
+        print(f"[SUCCESS] База данных подготовлена ({args.db_init})")
+        return 0
+    
+    workers = 1 if args.reload else resolve_workers(args.workers)
+    if workers > 1:
+        if settings.cache_enabled and settings.cache_backend == "memory":
+            # In-process кеш не видит записей других воркеров и отдавал бы устаревшие ответы.
+            # Воркеры запускаются новыми процессами и читают настройки из окружения
+            os.environ["CACHE_ENABLED"] = "false"
+            logger.warning(
+                "CACHE_BACKEND=memory is process-local: response cache disabled for %d workers "
+                "(use CACHE_BACKEND=redis to keep caching)", workers,
+            )
+        if settings.events_backend == "memory":
+            logger.warning("EVENTS_BACKEND=memory with %d workers: subscribers only see changes made via their worker", workers)
+    
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=args.reload,
+        loop=_fastest("uvloop", "asyncio"),
+        http=_fastest("httptools", "h11"),
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        access_log=settings.server_access_log,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Счётчики элементов пользователя по статусу, типу, приоритету и тегам
+
+Счётчики меняются в той же транзакции, что и элементы, поэтому GET /users/{id}/stats
+не делает GROUP BY по items. Пересчёт с нуля (например, после ручных правок БД):
+
+    python -m app.stats
+    python -m app.stats --user-id 1
+"""
+import argparse
+import sys
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, insert_or_increment
+from app.models import Item, UserItemStat, item_tags
+
+# Измерения-колонки Item; теги учитываются отдельно (измерение "tag")
+ITEM_DIMENSIONS = ("status", "kind", "priority")
+
+
+def item_counters(user_id: int, values, tag_ids: Iterable[int] = (), sign: int = 1) -> Counter:
+    """Изменения счётчиков для одного элемента: sign=1 — добавлен, -1 — удалён
+    
+    values — словарь или объект (Item, ItemCreate) со status/kind/priority.
+    Складывать результаты нужно через Counter.update: оператор + отбрасывает отрицательные.
+    """
+    changes = Counter()
+    for dimension in ITEM_DIMENSIONS:
+        value = values[dimension] if isinstance(values, dict) else getattr(values, dimension)
+        changes[(user_id, dimension, getattr(value, "value", value))] += sign
+    for tag_id in tag_ids:
+        changes[(user_id, "tag", str(tag_id))] += sign
+    return changes
+
+
+def apply_counters(db: Session, changes: Counter) -> None:
+    """Применить изменения {(user_id, dimension, key): delta} одним upsert"""
+    rows = [
+        {"user_id": user_id, "dimension": dimension, "key": key, "count": delta}
+        for (user_id, dimension, key), delta in sorted(changes.items())
+        if delta
+    ]
+    insert_or_increment(db, UserItemStat.__table__, rows, ["user_id", "dimension", "key"], "count")
+
+
+def forget_tag(db: Session, user_id: int, tag_id: int) -> None:
+    """Удалить счётчик тега (тег удалён вместе со связями)"""
+    db.execute(delete(UserItemStat).where(
+        UserItemStat.user_id == user_id,
+        UserItemStat.dimension == "tag",
+        UserItemStat.key == str(tag_id),
+    ))
+
+
+def rebuild_stats(db: Session, user_id: Optional[int] = None) -> int:
+    """Пересчитать счётчики по items/item_tags (для всех или одного пользователя); вернуть число строк"""
+    statement = delete(UserItemStat)
+    if user_id is not None:
+        statement = statement.where(UserItemStat.user_id == user_id)
+    db.execute(statement)
+    
+    changes = Counter()
+    for dimension in ITEM_DIMENSIONS:
+        column = getattr(Item, dimension)
+        query = select(Item.user_id, column, func.count()).group_by(Item.user_id, column)
+        if user_id is not None:
+            query = query.where(Item.user_id == user_id)
+        for owner, value, count in db.execute(query):
+            changes[(owner, dimension, value.value)] = count
+    
+    query = (
+        select(Item.user_id, item_tags.c.tag_id, func.count())
+        .join(item_tags, item_tags.c.item_id == Item.id)
+        .group_by(Item.user_id, item_tags.c.tag_id)
+    )
+    if user_id is not None:
+        query = query.where(Item.user_id == user_id)
+    for owner, tag_id, count in db.execute(query):
+        changes[(owner, "tag", str(tag_id))] = count
+    
+    apply_counters(db, changes)
+    return len(changes)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Точка входа CLI: пересчёт счётчиков"""
+    parser = argparse.ArgumentParser(prog="python -m app.stats", description="Пересчёт счётчиков статистики пользователей")
+    parser.add_argument("--user-id", type=int, help="Только этот пользователь (по умолчанию — все)")
+    args = parser.parse_args(argv)
+    
+    db = SessionLocal()
+    try:
+        rows = rebuild_stats(db, args.user_id)
+        db.commit()
+    finally:
+        db.close()
+    
+    print(f"[SUCCESS] Счётчики пересчитаны: {rows} строк")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Дельта-синхронизация: токены позиции в журнале изменений и заполнение журнала"""
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import false, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.database import _dialect_insert
+from app.models import Item, SyncChange, Tag, User
+
+
+def encode_sync_token(seq: int, entity: str, entity_id: int) -> str:
+    """Позиция последнего отданного изменения → непрозрачный токен"""
+    payload = json.dumps({"seq": seq, "e": entity, "id": entity_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> tuple[int, str, int]:
+    """Токен → (seq, entity, entity_id); некорректный токен — 400"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return int(payload["seq"]), str(payload["e"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def backfill_changes(db: Session, user_id: Optional[int] = None) -> None:
+    """Внести в журнал объекты, которых в нём нет (данные до появления журнала или вставленные в обход API)
+    
+    Версия затронутых пользователей поднимается, чтобы записи попали в выдачу и для
+    клиентов, уже синхронизированных до текущей версии.
+    """
+    missing_items = select(Item.user_id).where(
+        ~select(SyncChange.entity_id).where(
+            SyncChange.user_id == Item.user_id, SyncChange.entity == "item", SyncChange.entity_id == Item.id,
+        ).exists()
+    )
+    missing_tags = select(Tag.user_id).where(
+        ~select(SyncChange.entity_id).where(
+            SyncChange.user_id == Tag.user_id, SyncChange.entity == "tag", SyncChange.entity_id == Tag.id,
+        ).exists()
+    )
+    users = update(User).where(User.id.in_(missing_items.union(missing_tags)))
+    if user_id is not None:
+        users = users.where(User.id == user_id)
+    db.execute(users.values(data_version=User.data_version + 1), execution_options={"synchronize_session": False})
+    
+    for entity, model in (("item", Item), ("tag", Tag)):
+        rows = (
+            select(model.user_id, literal(entity), model.id, User.data_version, false())
+            .join(User, User.id == model.user_id)
+        )
+        if user_id is not None:
+            rows = rows.where(model.user_id == user_id)
+        statement = _dialect_insert(db, SyncChange.__table__, "backfill_changes").from_select(
+            ["user_id", "entity", "entity_id", "seq", "deleted"], rows,
+        )
+        db.execute(statement.on_conflict_do_nothing())
@@ -0,0 +1,58 @@
+"""Версии данных пользователя и журнал изменений для синхронизации"""
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.database import upsert
+from app.events import queue_event
+from app.models import SyncChange, User
+
+
+def bump_user_version(db: Session, user_id: int) -> int:
+    """Отметить изменение данных пользователя (в той же транзакции, что и запись); вернуть новую версию
+    
+    UPDATE блокирует строку пользователя до конца транзакции, поэтому версии
+    одного пользователя фиксируются строго по возрастанию.
+    """
+    return db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1, data_modified_at=datetime.utcnow())
+        .returning(User.data_version)
+    ).scalar_one()
+
+
+def record_changes(
+    db: Session,
+    user_id: int,
+    items: Iterable[int] = (),
+    tags: Iterable[int] = (),
+    deleted_items: Iterable[int] = (),
+    deleted_tags: Iterable[int] = (),
+) -> int:
+    """Поднять версию пользователя и записать изменённые/удалённые объекты в журнал синхронизации
+    
+    После commit подписчики пользователя получат событие с id объектов (app.events).
+    """
+    seq = bump_user_version(db, user_id)
+    changes = {
+        "items": list(dict.fromkeys(items)),
+        "tags": list(dict.fromkeys(tags)),
+        "deleted_items": list(dict.fromkeys(deleted_items)),
+        "deleted_tags": list(dict.fromkeys(deleted_tags)),
+    }
+    rows = [
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id, "seq": seq, "deleted": deleted}
+        for entity, ids, deleted in (
+            ("item", changes["items"], False),
+            ("tag", changes["tags"], False),
+            ("item", changes["deleted_items"], True),
+            ("tag", changes["deleted_tags"], True),
+        )
+        for entity_id in ids
+    ]
+    upsert(db, SyncChange.__table__, rows, ["user_id", "entity", "entity_id"], ["seq", "deleted"])
+    queue_event(db, user_id, {"type": "change", "user_id": user_id, "version": seq, **changes})
+    return seq
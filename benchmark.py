@@ -0,0 +1,263 @@
+"""Нагрузочный бенчмарк основных эндпоинтов (in-process, без сети)
+
+Примеры:
+
+    # Отдельная БД, генерация данных и прогон всех сценариев
+    DATABASE_URL=sqlite:///./bench.db python benchmark.py --generate --users 20 --items 5000
+    # Только выбранные сценарии, результат в JSON для сравнения между коммитами
+    python benchmark.py --scenario list_default --scenario list_tag_any --requests 500 --output bench.json
+
+Кеш ответов по умолчанию отключён, чтобы измерять работу с БД; --with-cache включает его.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_scenarios(db, rng: random.Random) -> dict:
+    """Сценарии: имя → функция, возвращающая (метод, путь, параметры) для очередного запроса"""
+    from sqlalchemy import func, select
+    
+    from app.models import Item, Tag
+    
+    # Берём пользователей с наибольшими списками — худший случай для списочных запросов
+    user_ids = list(db.scalars(
+        select(Item.user_id).group_by(Item.user_id).order_by(func.count().desc()).limit(10)
+    ))
+    if not user_ids:
+        raise SystemExit("[ERROR] В БД нет элементов. Запустите с --generate или python generate_data.py")
+    tags_by_user = {
+        user_id: list(db.scalars(select(Tag.id).where(Tag.user_id == user_id).order_by(Tag.id).limit(5)))
+        for user_id in user_ids
+    }
+    item_ids = list(db.scalars(select(Item.id).order_by(func.random()).limit(1000)))
+    words = ["python", "history", "design", "data", "guide", "код"]
+    
+    def user():
+        return rng.choice(user_ids)
+    
+    def tag_pair(user_id):
+        tags = tags_by_user[user_id] or [0]
+        return ",".join(str(tag_id) for tag_id in tags[:2])
+    
+    def with_user(**params):
+        user_id = user()
+        return {"user_id": user_id, **{k: v(user_id) if callable(v) else v for k, v in params.items()}}
+    
+    return {
+        "list_default": lambda: ("GET", "/items", with_user()),
+        "list_status": lambda: ("GET", "/items", with_user(status="reading")),
+        "list_sort_priority": lambda: ("GET", "/items", with_user(sort_by="priority", limit=100)),
+        "list_page_100": lambda: ("GET", "/items", with_user(limit=100)),
+        "list_deep_offset": lambda: ("GET", "/items", with_user(offset=1000, limit=50)),
+        "list_no_total": lambda: ("GET", "/items", with_user(include_total=False)),
+        "list_tag_any": lambda: ("GET", "/items", with_user(tag_ids=tag_pair)),
+        "list_tag_all": lambda: ("GET", "/items", with_user(tag_ids=tag_pair, tag_match="all")),
+        "list_title_contains": lambda: ("GET", "/items", with_user(title_contains=rng.choice(words))),
+        "list_search": lambda: ("GET", "/items", with_user(q=rng.choice(words))),
+        "get_item": lambda: ("GET", f"/items/{rng.choice(item_ids)}", {}),
+        "list_tags": lambda: ("GET", "/tags", with_user()),
+        "list_tags_popular": lambda: ("GET", "/tags", with_user(sort_by="popularity", counts_by_status=True, limit=50)),
+    }
+
+
+# Сценарии, где сортировка без индекса ожидаема: порядок по релевантности FTS,
+# tag-first выборка по всем тегам (GROUP BY по item_id небольшого множества)
+# и теги по популярности (ORDER BY по агрегату)
+EXPECTED_SORTS = {"list_search", "list_tag_all", "list_tags_popular"}
+
+
+def explain(client, engine, scenarios: dict, selected: list[str]) -> dict:
+    """Планы SELECT по items для одного запроса каждого сценария (только SQLite)
+    
+    Отмечает сценарии, где сортировка идёт через временное B-дерево, а не по индексу.
+    Запросы перехватываются на engine, обслуживающем API (при ASYNC_DB=true — async_engine),
+    EXPLAIN выполняется через синхронный engine.
+    """
+    from sqlalchemy import event
+    
+    from app.database import serving_engine
+    
+    if engine.dialect.name != "sqlite":
+        raise SystemExit("[ERROR] --explain поддерживается только для SQLite")
+    
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")) and " items" in statement:
+            captured.append((statement, parameters))
+    
+    plans = {}
+    for name in selected:
+        method, path, params = scenarios[name]()
+        captured.clear()
+        event.listen(serving_engine, "before_cursor_execute", capture)
+        try:
+            client.request(method, path, params=params)
+        finally:
+            event.remove(serving_engine, "before_cursor_execute", capture)
+        
+        with engine.connect() as connection:
+            statements = []
+            for statement, parameters in captured:
+                rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                detail = [row[-1] for row in rows]
+                statements.append({
+                    "sql": " ".join(statement.split())[:200],
+                    "plan": detail,
+                    "temp_btree": any("USE TEMP B-TREE" in line for line in detail),
+                })
+        plans[name] = statements
+    return plans
+
+
+def run(args) -> dict:
+    """Прогнать сценарии и собрать статистику"""
+    if not args.with_cache:
+        os.environ["CACHE_ENABLED"] = "false"
+    
+    if args.generate:
+        from generate_data import generate
+        
+        print("[INFO] Генерация данных...", file=sys.stderr)
+        stats = generate(args.users, args.items, args.tags, args.link_density, args.skew, args.seed)
+        print(f"[INFO] Создано элементов: {stats['items']} за {stats['elapsed_seconds']} с", file=sys.stderr)
+    
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    
+    from app.database import SessionLocal, engine, serving_engine
+    from app.main import app
+    
+    statements = [0]
+    
+    def count_statement(*_):
+        statements[0] += 1
+    
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        scenarios = build_scenarios(db, rng)
+    finally:
+        db.close()
+    
+    selected = args.scenario or list(scenarios)
+    unknown = set(selected) - scenarios.keys()
+    if unknown:
+        raise SystemExit(f"[ERROR] Неизвестные сценарии: {', '.join(sorted(unknown))}")
+    
+    if args.explain:
+        with TestClient(app) as client:
+            return {"revision": _git_revision(), "plans": explain(client, engine, scenarios, selected)}
+    
+    event.listen(serving_engine, "before_cursor_execute", count_statement)
+    results = {}
+    with TestClient(app) as client:
+        for name in selected:
+            make_request = scenarios[name]
+            for _ in range(args.warmup):
+                method, path, params = make_request()
+                client.request(method, path, params=params)
+            
+            latencies = []
+            queries = []
+            errors = 0
+            started = perf_counter()
+            for _ in range(args.requests):
+                method, path, params = make_request()
+                statements[0] = 0
+                request_started = perf_counter()
+                response = client.request(method, path, params=params)
+                latencies.append((perf_counter() - request_started) * 1000)
+                queries.append(statements[0])
+                if response.status_code >= 400:
+                    errors += 1
+            elapsed = perf_counter() - started
+            
+            results[name] = {
+                "requests": args.requests,
+                "errors": errors,
+                "p50_ms": round(_percentile(latencies, 50), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+                "p99_ms": round(_percentile(latencies, 99), 3),
+                "mean_ms": round(statistics.fmean(latencies), 3),
+                "throughput_rps": round(args.requests / elapsed, 1),
+                "queries_per_request": round(statistics.fmean(queries), 2),
+            }
+    event.remove(serving_engine, "before_cursor_execute", count_statement)
+    
+    return {
+        "revision": _git_revision(),
+        "database_url": engine.url.render_as_string(hide_password=True),
+        "cache": args.with_cache,
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный бенчмарк Reading List API")
+    parser.add_argument("--scenario", action="append", help="Сценарий (можно несколько; по умолчанию все)")
+    parser.add_argument("--requests", type=int, default=200, help="Запросов на сценарий")
+    parser.add_argument("--warmup", type=int, default=20, help="Прогревочных запросов на сценарий")
+    parser.add_argument("--with-cache", action="store_true", help="Не отключать кеш ответов")
+    parser.add_argument("--output", help="Файл для результатов в JSON")
+    parser.add_argument("--seed", type=int, default=42, help="Seed для выбора параметров запросов")
+    parser.add_argument("--explain", action="store_true", help="Вместо замеров вывести планы запросов (SQLite)")
+    generation = parser.add_argument_group("генерация данных перед прогоном")
+    generation.add_argument("--generate", action="store_true", help="Сгенерировать данные (см. generate_data.py)")
+    generation.add_argument("--users", type=int, default=10)
+    generation.add_argument("--items", type=int, default=1000)
+    generation.add_argument("--tags", type=int, default=20)
+    generation.add_argument("--link-density", type=float, default=1.5)
+    generation.add_argument("--skew", type=float, default=1.0)
+    args = parser.parse_args()
+    
+    report = run(args)
+    
+    if args.explain:
+        sorting = 0
+        for name, statements in report["plans"].items():
+            for statement in statements:
+                marker = "TEMP B-TREE" if statement["temp_btree"] else "ok"
+                sorting += statement["temp_btree"] and name not in EXPECTED_SORTS
+                print(f"{name:<22}{marker:<13}{statement['sql'][:90]}")
+                for line in statement["plan"]:
+                    print(f"{'':<35}{line}")
+        if args.output:
+            with open(args.output, "w") as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+        return 1 if sorting else 0
+    
+    print(f"{'scenario':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rps':>9}{'queries':>9}{'errors':>8}")
+    for name, result in report["scenarios"].items():
+        print(
+            f"{name:<22}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{result['throughput_rps']:>9.1f}{result['queries_per_request']:>9.2f}{result['errors']:>8}"
+        )
+    
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        print(f"[SUCCESS] Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
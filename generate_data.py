@@ -0,0 +1,159 @@
+"""Генератор большого синтетического набора данных для нагрузочного тестирования
+
+Примеры:
+
+    python generate_data.py --users 100 --items 2000 --tags 30
+    python generate_data.py --users 10 --items 50000 --tags 200 --link-density 2.5 --skew 1.2
+
+Количество элементов у пользователей распределено неравномерно (Парето),
+приоритет, статус и теги — со смещением к «популярным» значениям, как в реальных списках.
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+from time import perf_counter
+
+from sqlalchemy import func, insert, select
+
+from app.database import SessionLocal, init_db
+from app.models import User, Item, Tag, item_tags
+from app.models.item import ItemKind, ItemStatus, ItemPriority
+from app.stats import rebuild_stats
+from app.sync import backfill_changes
+
+# Размер пачки для executemany
+BATCH_SIZE = 5000
+
+WORDS = [
+    "python", "history", "design", "patterns", "galaxy", "data", "systems", "science",
+    "fiction", "guide", "introduction", "advanced", "modern", "practical", "theory",
+    "distributed", "learning", "machine", "network", "art", "programming", "war", "peace",
+    "чистый", "код", "история", "книга", "алгоритмы", "архитектура", "введение",
+]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _items_per_user(users: int, items: int, skew: float, rng: random.Random) -> list[int]:
+    """Число элементов на пользователя: Парето со средним ≈ items"""
+    if skew <= 0:
+        return [items] * users
+    weights = [rng.paretovariate(skew + 1) for _ in range(users)]
+    scale = items * users / sum(weights)
+    return [max(1, round(weight * scale)) for weight in weights]
+
+
+def generate(
+    users: int = 10,
+    items: int = 1000,
+    tags: int = 20,
+    link_density: float = 1.5,
+    skew: float = 1.0,
+    seed: int = 42,
+) -> dict:
+    """Создать пользователей, теги, элементы и связи пачками; вернуть статистику"""
+    rng = random.Random(seed)
+    started = perf_counter()
+    init_db()
+    
+    db = SessionLocal()
+    try:
+        first_user = (db.scalar(select(func.max(User.id))) or 0) + 1
+        now = datetime.utcnow()
+        
+        user_rows = [
+            {
+                "email": f"bench-{first_user + i}@example.com",
+                "display_name": f"Bench User {first_user + i}",
+                "created_at": now - timedelta(days=365),
+            }
+            for i in range(users)
+        ]
+        user_ids = list(db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), user_rows))
+        
+        tag_rows = [{"user_id": user_id, "name": f"tag-{n}"} for user_id in user_ids for n in range(tags)]
+        tag_ids = list(db.scalars(insert(Tag).returning(Tag.id, sort_by_parameter_order=True), tag_rows)) if tag_rows else []
+        tags_by_user = {user_id: tag_ids[i * tags:(i + 1) * tags] for i, user_id in enumerate(user_ids)}
+        
+        kinds = list(ItemKind)
+        statuses = list(ItemStatus)
+        priorities = list(ItemPriority)
+        
+        def item_rows():
+            for user_id, count in zip(user_ids, _items_per_user(users, items, skew, rng)):
+                for _ in range(count):
+                    created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+                    yield {
+                        "user_id": user_id,
+                        "title": " ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+                        "kind": rng.choices(kinds, weights=[3, 1])[0],
+                        "status": rng.choices(statuses, weights=[5, 2, 3])[0],
+                        "priority": rng.choices(priorities, weights=[2, 6, 2])[0],
+                        "notes": " ".join(rng.choices(WORDS, k=rng.randint(0, 30))) or None,
+                        "created_at": created_at,
+                        "updated_at": created_at + timedelta(seconds=rng.randint(0, 30 * 24 * 3600)),
+                    }
+        
+        total_items = 0
+        total_links = 0
+        for batch in _chunks(item_rows(), BATCH_SIZE):
+            item_ids = list(db.scalars(insert(Item).returning(Item.id, sort_by_parameter_order=True), batch))
+            links = []
+            for item_id, row in zip(item_ids, batch):
+                user_tags = tags_by_user[row["user_id"]]
+                if not user_tags:
+                    continue
+                # Популярные теги (с меньшим номером) встречаются чаще
+                count = min(len(user_tags), int(rng.expovariate(1 / link_density)) if link_density > 0 else 0)
+                chosen = {user_tags[min(int(rng.paretovariate(1.2)) - 1, len(user_tags) - 1)] for _ in range(count)}
+                links.extend({"item_id": item_id, "tag_id": tag_id} for tag_id in chosen)
+            if links:
+                db.execute(insert(item_tags), links)
+            db.commit()
+            total_items += len(batch)
+            total_links += len(links)
+        
+        # Счётчики для GET /users/{id}/stats
+        for user_id in user_ids:
+            rebuild_stats(db, user_id)
+        # Журнал для GET /sync
+        backfill_changes(db)
+        db.commit()
+    finally:
+        db.close()
+    
+    return {
+        "users": len(user_ids),
+        "tags": len(tag_ids),
+        "items": total_items,
+        "links": total_links,
+        "user_ids": user_ids,
+        "elapsed_seconds": round(perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных для нагрузочного тестирования")
+    parser.add_argument("--users", type=int, default=10, help="Количество пользователей")
+    parser.add_argument("--items", type=int, default=1000, help="Среднее число элементов на пользователя")
+    parser.add_argument("--tags", type=int, default=20, help="Тегов на пользователя")
+    parser.add_argument("--link-density", type=float, default=1.5, help="Среднее число тегов на элемент")
+    parser.add_argument("--skew", type=float, default=1.0, help="Неравномерность элементов по пользователям (0 — равномерно)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора случайных чисел")
+    args = parser.parse_args()
+    
+    print("[INFO] Генерация данных...")
+    stats = generate(args.users, args.items, args.tags, args.link_density, args.skew, args.seed)
+    print(
+        f"[SUCCESS] Пользователей: {stats['users']}, тегов: {stats['tags']}, "
+        f"элементов: {stats['items']}, связей: {stats['links']} за {stats['elapsed_seconds']} с"
+    )
+
+
+if __name__ == "__main__":
+    main()
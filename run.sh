@@ -27,6 +27,6 @@ echo "[SUCCESS] Запуск сервера на http://localhost:8000"
 echo "[INFO] Документация: http://localhost:8000/docs"
 echo ""
 
-# Запуск сервера
-python -m app.main
+# Запуск сервера (режим разработки с перезапуском при правках)
+python -m app.serve --reload
 
@@ -2,16 +2,18 @@
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal, init_db
 from app.models import User, Item, Tag
 from app.models.item import ItemKind, ItemStatus, ItemPriority
+from app.stats import rebuild_stats
+from app.sync import backfill_changes
 
 
 def create_seed_data():
     """Создать тестовые данные"""
     
     # Создаём таблицы если их нет
-    Base.metadata.create_all(bind=engine)
+    init_db()
     
     db: Session = SessionLocal()
     
@@ -172,6 +174,11 @@ def create_seed_data():
         for item in items_user1 + items_user2:
             db.add(item)
         
+        db.flush()
+        # Счётчики для GET /users/{id}/stats
+        rebuild_stats(db)
+        # Журнал для GET /sync
+        backfill_changes(db)
         db.commit()
         
         print(f"[SUCCESS] Создано {len(items_user1) + len(items_user2)} элементов списка чтения")
@@ -180,7 +187,7 @@ def create_seed_data():
         print(f"   - Пользователей: {db.query(User).count()}")
         print(f"   - Элементов: {db.query(Item).count()}")
         print(f"   - Тегов: {db.query(Tag).count()}")
-        
+    
     except Exception as e:
         print(f"[ERROR] Ошибка при создании seed данных: {e}")
         db.rollback()
@@ -0,0 +1,59 @@
+"""Общие фикстуры: отдельная SQLite-БД с синтетическими данными и TestClient
+
+Переменные окружения выставляются до импорта app — настройки и engine
+создаются при импорте.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="reading-list-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir.name}/test.db"
+# Кеш ответов выключен: тесты проверяют работу с БД, а не попадания в кеш
+os.environ["CACHE_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import engine, serving_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def dataset() -> dict:
+    """Небольшой набор данных generate_data (3 пользователя, ~200 элементов у каждого, с тегами)"""
+    stats = generate(users=3, items=200, tags=10, link_density=1.5, skew=0, seed=42)
+    yield stats
+    engine.dispose()
+    _tmpdir.cleanup()
+
+
+@pytest.fixture(scope="session")
+def client(dataset) -> TestClient:
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def count_statements():
+    """Счётчик SQL-запросов через before_cursor_execute; вызывать как контекст вокруг запроса
+    
+    Слушает engine, который обслуживает запросы API (при ASYNC_DB=true — async_engine).
+    """
+    @contextmanager
+    def counter():
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(serving_engine, "before_cursor_execute", capture)
+        try:
+            yield statements
+        finally:
+            event.remove(serving_engine, "before_cursor_execute", capture)
+    
+    return counter
@@ -0,0 +1,45 @@
+"""Число SQL-запросов на GET /items не зависит от размера страницы (нет N+1)"""
+import pytest
+
+
+def _list(client, count_statements, **params):
+    with count_statements() as statements:
+        response = client.get("/items", params=params)
+    assert response.status_code == 200, response.text
+    return response.json(), len(statements)
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"include_total": False},
+    {"status": "planned"},
+    {"sort_by": "priority"},
+])
+def test_list_statement_count_does_not_depend_on_limit(client, dataset, count_statements, params):
+    user_id = dataset["user_ids"][0]
+    _list(client, count_statements, user_id=user_id, limit=1, **params)  # прогрев
+    
+    small, small_count = _list(client, count_statements, user_id=user_id, limit=1, **params)
+    large, large_count = _list(client, count_statements, user_id=user_id, limit=50, **params)
+    
+    assert len(small["data"]) == 1
+    assert len(large["data"]) == 50
+    # Страница должна содержать элементы с тегами, иначе подгрузка тегов не проверяется
+    assert sum(1 for item in large["data"] if item["tags"]) > 1
+    assert small_count > 0
+    assert small_count == large_count
+
+
+def test_list_by_tag_statement_count_does_not_depend_on_limit(client, dataset, count_statements):
+    user_id = dataset["user_ids"][0]
+    tags = client.get("/tags", params={"user_id": user_id, "sort_by": "popularity", "limit": 1}).json()["data"]
+    params = {"user_id": user_id, "tag_ids": str(tags[0]["id"])}
+    _list(client, count_statements, limit=1, **params)
+    
+    small, small_count = _list(client, count_statements, limit=1, **params)
+    large, large_count = _list(client, count_statements, limit=50, **params)
+    
+    assert len(large["data"]) == 50
+    assert all(item["tags"] for item in large["data"])
+    assert small_count > 0
+    assert small_count == large_count
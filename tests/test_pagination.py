@@ -0,0 +1,35 @@
+"""Курсорная пагинация: испорченный курсор — 400, а не пустая страница"""
+import base64
+import json
+
+import pytest
+
+
+def _cursor(**payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("payload", [
+    {"s": "created_at", "o": "desc", "v": None, "id": 1},
+    {"s": "created_at", "o": "desc", "id": 1},
+    {"s": "created_at", "o": "desc", "v": 5, "id": 1},
+])
+def test_items_invalid_cursor(client, dataset, payload):
+    response = client.get("/items", params={"user_id": dataset["user_ids"][0], "cursor": _cursor(**payload)})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("sort_by, value", [("name", None), ("popularity", None), ("popularity", "x")])
+def test_tags_invalid_cursor(client, dataset, sort_by, value):
+    sort_order = "desc" if sort_by == "popularity" else "asc"
+    params = {"user_id": dataset["user_ids"][0], "sort_by": sort_by, "limit": 2}
+    response = client.get("/tags", params={**params, "cursor": _cursor(s=sort_by, o=sort_order, v=value, id=1)})
+    assert response.status_code == 400
+
+
+def test_items_cursor_pages_do_not_overlap(client, dataset):
+    params = {"user_id": dataset["user_ids"][0], "limit": 20, "include_total": False}
+    first = client.get("/items", params=params).json()
+    second = client.get("/items", params={**params, "cursor": first["next_cursor"]}).json()
+    assert len(second["data"]) == 20
+    assert not {item["id"] for item in first["data"]} & {item["id"] for item in second["data"]}
@@ -0,0 +1,39 @@
+"""Планы запросов сценариев benchmark.py: сортировка по индексу, без временного B-дерева"""
+import random
+
+import pytest
+
+from app.database import SessionLocal, engine
+from benchmark import EXPECTED_SORTS, build_scenarios, explain
+
+
+@pytest.fixture(scope="module")
+def scenarios(dataset):
+    db = SessionLocal()
+    try:
+        return build_scenarios(db, random.Random(42))
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def plans(client, scenarios):
+    if engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN проверяется только для SQLite")
+    return explain(client, engine, scenarios, list(scenarios))
+
+
+def test_items_scenarios_are_explained(scenarios, plans):
+    """Каждый сценарий по /items должен дать хотя бы один план, иначе проверка ниже пустая"""
+    items_scenarios = [name for name, make_request in scenarios.items() if make_request()[1].startswith("/items")]
+    assert items_scenarios
+    assert [name for name in items_scenarios if not plans[name]] == []
+
+
+def test_no_unexpected_temp_btree(plans):
+    sorting = {
+        name: [statement["sql"] for statement in statements if statement["temp_btree"]]
+        for name, statements in plans.items()
+        if name not in EXPECTED_SORTS
+    }
+    assert {name: sql for name, sql in sorting.items() if sql} == {}
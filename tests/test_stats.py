@@ -0,0 +1,95 @@
+"""Счётчики /users/{id}/stats совпадают с пересчётом после любых записей
+
+Счётчики обновляются инкрементально в каждом пути записи; случайная
+последовательность одиночных, bulk-, теговых записей и импорта не должна
+расходиться с rebuild_stats.
+"""
+import random
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import User
+from app.stats import rebuild_stats
+
+STATUSES = ["planned", "reading", "done"]
+KINDS = ["book", "article"]
+PRIORITIES = ["low", "normal", "high"]
+
+
+@pytest.fixture
+def user_id(client) -> int:
+    """Отдельный пользователь, чтобы записи не меняли данные других тестов"""
+    db = SessionLocal()
+    try:
+        user = User(email=f"stats-{random.getrandbits(32)}@example.com", display_name="Stats")
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def _write(client, rng, user_id, tags, step):
+    """Одна случайная запись через API; вернуть ответ"""
+    ids = [item["id"] for item in client.get("/items", params={"user_id": user_id, "limit": 100, "fields": "title"}).json()["data"]]
+    operation = rng.randrange(13) if ids else 0
+    some_tags = rng.sample(tags, rng.randint(0, 2))
+    if operation == 0:
+        return client.post("/items", json={
+            "user_id": user_id, "title": f"item {step}", "kind": rng.choice(KINDS),
+            "status": rng.choice(STATUSES), "priority": rng.choice(PRIORITIES), "tag_ids": some_tags,
+        })
+    if operation == 1:
+        return client.patch(f"/items/{rng.choice(ids)}", json={"status": rng.choice(STATUSES), "priority": rng.choice(PRIORITIES)})
+    if operation == 2:
+        return client.delete(f"/items/{rng.choice(ids)}")
+    if operation == 3:
+        return client.post(f"/items/{rng.choice(ids)}/tags", json={"tag_ids": rng.sample(tags, 1)})
+    if operation == 4:
+        return client.put(f"/items/{rng.choice(ids)}/tags", json={"tag_ids": some_tags})
+    if operation == 5:
+        return client.request("DELETE", f"/items/{rng.choice(ids)}/tags", json={"tag_ids": rng.sample(tags, 2)})
+    if operation == 6:
+        return client.post("/items/bulk", json={"items": [
+            {"user_id": user_id, "title": f"bulk {step}", "kind": rng.choice(KINDS), "tag_ids": rng.sample(tags, 1)}
+            for _ in range(3)
+        ]})
+    if operation == 7:
+        return client.patch("/items/bulk", json={"items": [
+            {"id": item_id, "status": rng.choice(STATUSES), "kind": rng.choice(KINDS)}
+            for item_id in rng.sample(ids, min(3, len(ids)))
+        ]})
+    if operation == 8:
+        return client.request("DELETE", "/items/bulk", json={"ids": rng.sample(ids, min(2, len(ids)))})
+    if operation == 9:
+        return client.post("/items/bulk/tags", json={"ids": rng.sample(ids, min(3, len(ids))), "tag_ids": rng.sample(tags, 1)})
+    if operation == 10:
+        return client.request("DELETE", "/items/bulk/tags", json={"ids": rng.sample(ids, min(3, len(ids))), "tag_ids": rng.sample(tags, 1)})
+    if operation == 11:
+        line = f'{{"title": "imported {step}", "kind": "book", "status": "done", "tags": ["t0", "new-{step}"]}}\n'
+        return client.post("/items/import", params={"user_id": user_id}, files={"file": ("items.ndjson", line.encode())})
+    tag = client.post("/tags", json={"user_id": user_id, "name": f"extra-{step}"}).json()["data"]["id"]
+    client.post("/items/bulk/tags", json={"ids": rng.sample(ids, min(3, len(ids))), "tag_ids": [tag]})
+    return client.delete(f"/tags/{tag}")
+
+
+def test_counters_match_rebuild_after_random_writes(client, user_id):
+    rng = random.Random(7)
+    tags = [client.post("/tags", json={"user_id": user_id, "name": f"t{n}"}).json()["data"]["id"] for n in range(3)]
+    
+    for step in range(300):
+        response = _write(client, rng, user_id, tags, step)
+        assert response.status_code < 300, response.text
+    
+    incremental = client.get(f"/users/{user_id}/stats").json()
+    db = SessionLocal()
+    try:
+        rebuild_stats(db, user_id)
+        db.commit()
+    finally:
+        db.close()
+    rebuilt = client.get(f"/users/{user_id}/stats").json()
+    
+    assert rebuilt["data"]["total"] > 0
+    assert incremental == rebuilt